@@ -1,9 +1,10 @@
-import math
+import json
+from types import MappingProxyType
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import altair as alt
-import plotly.graph_objects as go
 
 import strokes_gained_engine as sge  # <-- your engine module
 
@@ -25,20 +26,22 @@ st.set_page_config(
 # Session state defaults
 # ------------------------------------------------------------
 
-DEFAULTS = {
+DEFAULTS = MappingProxyType({
     "mode": "Quick",              # Quick vs Advanced Caddy mode
     "skill": "Intermediate",      # Ball striking consistency
     "tendency": "Neutral",        # Usually Short / Neutral / Usually Long
     "tournament_mode": False,     # Tournament vs Normal play
     "handicap_factor": 1.0,       # SG / dispersion scaling by handicap
     "driver_speed": 100.0,        # mph, used to scale the bag
-}
+    "last_caddy": None,           # last submitted Caddy result (ranked + inputs)
+    "last_caddy_key": None,       # (mode, driver_speed, handicap_factor) it was built for
+})
 
 
 def init_session_state():
-    for k, v in DEFAULTS.items():
-        if k not in st.session_state:
-            st.session_state[k] = v
+    st.session_state.update(
+        {k: v for k, v in DEFAULTS.items() if k not in st.session_state}
+    )
 
 
 init_session_state()
@@ -49,64 +52,101 @@ init_session_state()
 # ------------------------------------------------------------
 
 def _category_for_club(club: str) -> str:
-    c = club.lower()
-    if c in ("driver",):
-        return "driver"
-    if c in ("3w", "5w"):
-        return "wood"
-    if c in ("3h", "4h", "5h"):
-        return "hybrid"
-    if c in ("4i", "5i"):
-        return "long_iron"
-    if c in ("6i", "7i"):
-        return "mid_iron"
-    if c in ("8i", "9i"):
-        return "short_iron"
-    return "scoring_wedge"
+    # Same table the engine uses to tag candidate shots
+    return sge.CLUB_CATEGORY.get(club, "scoring_wedge")
+
+
+# ------------------------------------------------------------
+# UI label -> engine value lookups (keyed on exact widget options)
+# ------------------------------------------------------------
+
+# Widget option lists, built once (with index lookups for default selection)
+_HANDICAP_LABELS = ("0–5", "6–12", "13–20", "21+")
+_TROUBLE_LEVELS = ("None", "Mild", "Severe")
+_TENDENCIES = ("Neutral", "Usually Short", "Usually Long")
+_TENDENCY_IDX = {t: i for i, t in enumerate(_TENDENCIES)}
+_SKILLS = ("Recreational", "Intermediate", "Highly Consistent")
+_SKILL_IDX = {sk: i for i, sk in enumerate(_SKILLS)}
+
+_SKILL_FACTOR = {
+    "Recreational": 1.3,
+    "Intermediate": 1.0,
+    "Highly Consistent": 0.8,
+}
+
+_HCAP_FACTORS = {
+    "0–5": 0.8,
+    "6–12": 1.0,
+    "13–20": 1.2,
+    "21+": 1.35,
+}
+
+
+# Auto-strategy: (long shot or severe long trouble, short shot with nothing short)
+_AUTO_STRATEGY = {
+    (True, False): sge.STRATEGY_CONSERVATIVE,
+    (True, True): sge.STRATEGY_CONSERVATIVE,
+    (False, True): sge.STRATEGY_AGGRESSIVE,
+}
+
+
+def _auto_strategy(target: float, short_trouble: str, long_trouble: str) -> str:
+    key = (
+        target > 190 or long_trouble == "Severe",
+        target < 130 and short_trouble == "None",
+    )
+    return _AUTO_STRATEGY.get(key, sge.STRATEGY_BALANCED)
+
+
+# Depth dispersion (±yds) per bag club, used by the yardage tables
+CLUB_TO_SIGMA = {
+    club: sge.get_dispersion_sigma(_category_for_club(club))
+    for club, *_ in sge.FULL_BAG_BASE
+}
 
 
 # ------------------------------------------------------------
 # Styling (simple dark-ish theme tweaks)
 # ------------------------------------------------------------
 
-st.markdown(
-    """
-    <style>
-    .main {
-        background-color: #05070b;
-    }
-    .stApp {
-        background-color: #05070b;
-    }
-    h1, h2, h3, h4, h5, h6 {
-        color: #f5f5f5;
-    }
-    .stMarkdown, .stText, .stCaption, label {
-        color: #e6e6e6 !important;
-    }
-    div[data-baseweb="input"] input {
-        background-color: #11151c !important;
-        color: #f5f5f5 !important;
-    }
-    .stSelectbox, .stNumberInput, .stSlider {
-        color: #f5f5f5 !important;
-    }
-    .stDataFrame {
-        background-color: #05070b !important;
-    }
-    thead tr th {
-        background-color: #10151f !important;
-    }
-    tbody tr {
-        background-color: #05070b !important;
-    }
-    .css-1dp5vir, .e1ewe7hr3 {
-        background-color: #05070b !important;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+_APP_CSS = """
+<style>
+.main {
+    background-color: #05070b;
+}
+.stApp {
+    background-color: #05070b;
+}
+h1, h2, h3, h4, h5, h6 {
+    color: #f5f5f5;
+}
+.stMarkdown, .stText, .stCaption, label {
+    color: #e6e6e6 !important;
+}
+div[data-baseweb="input"] input {
+    background-color: #11151c !important;
+    color: #f5f5f5 !important;
+}
+.stSelectbox, .stNumberInput, .stSlider {
+    color: #f5f5f5 !important;
+}
+.stDataFrame {
+    background-color: #05070b !important;
+}
+thead tr th {
+    background-color: #10151f !important;
+}
+tbody tr {
+    background-color: #05070b !important;
+}
+.css-1dp5vir, .e1ewe7hr3 {
+    background-color: #05070b !important;
+}
+</style>
+"""
+
+# Emitted on every run: Streamlit drops elements a rerun does not re-emit
+st.markdown(_APP_CSS, unsafe_allow_html=True)
 
 # ------------------------------------------------------------
 # Sidebar controls
@@ -127,20 +167,13 @@ with st.sidebar:
     st.markdown("**Handicap / Skill**")
     handicap_label = st.radio(
         "Approximate Handicap",
-        ["0–5", "6–12", "13–20", "21+"],
+        _HANDICAP_LABELS,
         index=1,  # default 6–12
         help="Used to scale dispersion windows & strokes-gained sensitivity. "
              "Lower handicap = tighter windows.",
     )
 
-    if handicap_label == "0–5":
-        st.session_state.handicap_factor = 0.8
-    elif handicap_label == "6–12":
-        st.session_state.handicap_factor = 1.0
-    elif handicap_label == "13–20":
-        st.session_state.handicap_factor = 1.2
-    else:
-        st.session_state.handicap_factor = 1.35
+    st.session_state.handicap_factor = _HCAP_FACTORS[handicap_label]
 
     # NEW: ambient temperature (°F)
     temp_f = st.slider(
@@ -151,7 +184,8 @@ with st.sidebar:
         step=1,
         help="Used for plays-like yardage calculations (hotter = ball flies farther).",
     )
-    st.session_state.temp_f = float(temp_f)
+    if st.session_state.get("temp_f") != temp_f:
+        st.session_state.temp_f = float(temp_f)
     
     st.markdown("---")
     st.markdown("**About Tournament Mode**")
@@ -179,54 +213,218 @@ driver_speed = st.slider(
     step=1.0,
     help="Used to scale your entire bag's distances from a 100 mph baseline.",
 )
-st.session_state.driver_speed = float(driver_speed)
+if st.session_state.driver_speed != driver_speed:
+    st.session_state.driver_speed = float(driver_speed)
+
+
+# ------------------------------------------------------------
+# Cached bag builders (only recompute when driver speed changes)
+# ------------------------------------------------------------
 
-# Build bag & candidates from engine
-all_shots_base, scoring_shots, full_bag = sge.build_all_candidate_shots(driver_speed)
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _cached_build(driver_speed: float):
+    """Memoized sge.build_all_candidate_shots, keyed on driver speed.
 
-def draw_range_dispersion(selected_club: str, full_bag, skill_label: str, handicap_factor: float):
+    Cached as a shared resource rather than unpickled per rerun: the engine
+    copies candidate rows before annotating them, so treat these as read-only.
+    """
+    return sge.build_all_candidate_shots(driver_speed)
+
+
+# Column order of the engine's full-bag rows
+_FULL_BAG_COLUMNS = [
+    "Club",
+    "Ball Speed (mph)",
+    "Launch (°)",
+    "Spin (rpm)",
+    "Carry (yds)",
+    "Total (yds)",
+]
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _full_bag_df(driver_speed: float) -> pd.DataFrame:
+    """Raw full-bag DataFrame for the yardage tables."""
+    return pd.DataFrame.from_records(_cached_build(driver_speed)[2], columns=_FULL_BAG_COLUMNS)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _scoring_df(driver_speed: float) -> pd.DataFrame:
+    """Scoring / partial shot table, sorted longest first."""
+    shots = _cached_build(driver_speed)[1]
+    # Built in final form; repeated labels as categoricals (smaller Arrow payload)
+    df = pd.DataFrame({
+        "Carry (yds)": [s["carry"] for s in shots],
+        "Club": pd.Categorical([s["club"] for s in shots]),
+        "Shot Type": pd.Categorical([s["shot_type"] for s in shots]),
+        "Trajectory": pd.Categorical([s["trajectory"] for s in shots]),
+    })
+    return df.sort_values("Carry (yds)", ascending=False, ignore_index=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _scoring_by_club(driver_speed: float) -> dict:
+    """Range-tab scoring tables keyed by club (rounded, longest first)."""
+    df = _scoring_df(driver_speed)
+    df["Carry (yds)"] = df["Carry (yds)"].round(0)
+    return {
+        club: group.reset_index(drop=True)
+        for club, group in df.groupby("Club", observed=True, sort=False)
+    }
+
+
+# Full-bag yardage table column order (dispersion next to the distances)
+_YARDAGE_COLUMNS = [
+    "Club",
+    "Carry (yds)",
+    "Total (yds)",
+    "Dispersion (±yds)",
+    "Ball Speed (mph)",
+    "Launch (°)",
+    "Spin (rpm)",
+]
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _yardage_table_df(driver_speed: float) -> pd.DataFrame:
+    """Full-bag yardage table with the per-club dispersion column."""
+    df = _full_bag_df(driver_speed)
+    df["Dispersion (±yds)"] = df["Club"].map(CLUB_TO_SIGMA)
+    return df[_YARDAGE_COLUMNS]
+
+
+# Display-only rounding for the yardage tables (leaves the data untouched)
+_BAG_COLUMN_CONFIG = {
+    "Carry (yds)": st.column_config.NumberColumn(format="%.0f"),
+    "Total (yds)": st.column_config.NumberColumn(format="%.0f"),
+    "Ball Speed (mph)": st.column_config.NumberColumn(format="%.1f"),
+}
+
+
+def _render_bag_tables(driver_speed: float, scoring_heading: str):
+    """Full-bag yardage table, then the scoring / partial shot table."""
+    st.dataframe(_yardage_table_df(driver_speed), column_config=_BAG_COLUMN_CONFIG, use_container_width=True)
+    st.markdown(scoring_heading)
+    st.dataframe(_scoring_df(driver_speed), column_config=_BAG_COLUMN_CONFIG, use_container_width=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _bag_by_club(driver_speed: float):
+    """Full-bag rows keyed by club name for O(1) lookups."""
+    return {row["Club"]: row for row in _cached_build(driver_speed)[2]}
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_recommend(driver_speed: float, target_final: float, target_pin: float,
+                      short_trouble: str, long_trouble: str,
+                      left_trouble: str, right_trouble: str,
+                      green_firmness: str, strategy_label: str,
+                      skill_factor: float, sg_profile_factor: float):
+    """
+    Memoized Caddy-mode sge.recommend_shots_with_sg. Every argument is a
+    plain scalar/label, and the candidate list is derived from driver_speed.
+    """
+    return sge.recommend_shots_with_sg(
+        target_total=target_final,
+        candidates=_cached_build(driver_speed)[0],
+        short_trouble_label=short_trouble,
+        long_trouble_label=long_trouble,
+        left_trouble_label=left_trouble,
+        right_trouble_label=right_trouble,
+        green_firmness_label=green_firmness,
+        strategy_label=strategy_label,
+        start_distance_yards=target_pin,
+        start_surface="fairway",
+        front_yards=0.0,
+        back_yards=0.0,
+        skill_factor=skill_factor,
+        pin_lateral_offset=0.0,
+        green_width=0.0,
+        n_sim=sge.DEFAULT_N_SIM,
+        top_n=5,
+        sg_profile_factor=sg_profile_factor,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_par3(driver_speed: float, hole_yards: float,
+                 skill_factor: float, sg_profile_factor: float):
+    """Memoized sge.par3_strategy for the Strategy tab (neutral trouble/strategy)."""
+    return sge.par3_strategy(
+        hole_yards=hole_yards,
+        candidates=_cached_build(driver_speed)[0],
+        skill_factor=skill_factor,
+        green_width=0.0,
+        short_trouble_label="None",
+        long_trouble_label="None",
+        left_trouble_label="None",
+        right_trouble_label="None",
+        strategy_label=sge.STRATEGY_BALANCED,
+        sg_profile_factor=sg_profile_factor,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_par45(par_type: str, driver_speed: float, hole_yards: float,
+                  fairway_width: str, tee_left_trouble: str, tee_right_trouble: str,
+                  skill_factor: float, sg_profile_factor: float):
+    """Memoized sge.par4_strategy / sge.par5_strategy (same tee-shot inputs)."""
+    strategy_fn = sge.par4_strategy if par_type == "Par 4" else sge.par5_strategy
+    return strategy_fn(
+        hole_yards=hole_yards,
+        full_bag=_cached_build(driver_speed)[2],
+        skill_factor=skill_factor,
+        fairway_width_label=fairway_width,
+        tee_left_trouble_label=tee_left_trouble,
+        tee_right_trouble_label=tee_right_trouble,
+        sg_profile_factor=sg_profile_factor,
+    )
+
+
+# Full-bag rows by club for the Range tab
+BAG_BY_CLUB = _bag_by_club(driver_speed)
+
+# Seeded PCG64 generator for dispersion previews (script reruns re-seed it,
+# so the same inputs redraw the same pattern)
+_RNG = np.random.default_rng(0xC0FFEE)
+
+def draw_range_dispersion(selected_club: str, bag_by_club, skill_label: str, handicap_factor: float):
     """
     Simulate and draw shot dispersion for the selected club in Range mode.
     Uses your engine's depth & lateral sigma logic, scaled by skill + handicap.
     """
     # Find club row
-    row = next((r for r in full_bag if r["Club"] == selected_club), None)
+    row = bag_by_club.get(selected_club)
     if row is None:
         st.info("No yardage data found for this club.")
         return
 
-    carry_center = float(row["Carry (yds)"])
+    carry_center = row["Carry (yds)"]
 
     # Map to category
     category = _category_for_club(selected_club)
 
     # Skill -> scale
-    skill_norm = (skill_label or "Intermediate").lower()
-    if skill_norm == "recreational":
-        skill_factor = 1.3
-    elif skill_norm == "highly consistent":
-        skill_factor = 0.8
-    else:
-        skill_factor = 1.0
-
-    skill_factor *= handicap_factor
+    skill_factor = _SKILL_FACTOR.get(skill_label, 1.0) * handicap_factor
 
     # Depth & lateral dispersion (already lie-aware via helper if you want)
     sigma_depth = sge.get_dispersion_sigma(category) * skill_factor * sge.lie_dispersion_factor("fairway")
     sigma_lat = sge.get_lateral_sigma(category) * skill_factor * sge.lie_dispersion_factor("fairway")
 
-    # Simulate shots
+    # Simulate shots: one (n, 2) standard-normal block, scaled per column
     n = 180
-    x = np.random.normal(loc=0.0, scale=sigma_lat, size=n)
-    y = np.random.normal(loc=carry_center, scale=sigma_depth, size=n)
+    z = _RNG.standard_normal((n, 2))
+    z *= (max(0.1, sigma_lat), max(0.1, sigma_depth))
+    z[:, 1] += carry_center
 
-    df = pd.DataFrame({"x": x, "y": y})
+    df = pd.DataFrame(z, columns=["x", "y"])
 
-    # For bands & guides
+    # For bands & guides: one ±1σ depth rect spanning the lateral axis domain
     band_df = pd.DataFrame({
-        "x": [-30, 30],
-        "y_min": [carry_center - sigma_depth, carry_center - sigma_depth],
-        "y_max": [carry_center + sigma_depth, carry_center + sigma_depth],
+        "x": [-3 * sigma_lat],
+        "x2": [3 * sigma_lat],
+        "y_min": [carry_center - sigma_depth],
+        "y_max": [carry_center + sigma_depth],
     })
     target_line_df = pd.DataFrame({"x": [0.0]})
 
@@ -252,15 +450,12 @@ def draw_range_dispersion(selected_club: str, full_bag, skill_label: str, handic
         .mark_rect(opacity=0.12, color="#ecf0f1")
         .encode(
             x="x:Q",
-            x2=alt.X2("x2:Q", field="x"),
+            x2="x2:Q",
             y="y_min:Q",
             y2="y_max:Q",
         )
     )
 
-    # quick trick so x2 works from same column
-    band = band.encode(x2="x:Q")
-
     target_line = (
         alt.Chart(target_line_df)
         .mark_rule(color="#f1c40f", strokeWidth=2)
@@ -287,6 +482,420 @@ def draw_range_dispersion(selected_club: str, full_bag, skill_label: str, handic
     st.altair_chart(chart, use_container_width=True)
 
 
+@st.cache_data(show_spinner=False)
+def _green_overview_spec(short_trouble, long_trouble, left_trouble, right_trouble,
+                         pin_location, strategy_label: str = "Balanced") -> dict:
+    """
+    Vega-Lite spec for the aerial green overview, cached per input combination
+    (all inputs are plain labels, so the spec is fully determined by them).
+    """
+    trouble_height_map = {"None": 0, "Mild": 8, "Severe": 14}
+
+    # Base green rectangle
+    green_df = pd.DataFrame({"x": [-15], "x2": [15], "y": [0], "y2": [30]})
+    green = (
+        alt.Chart(green_df)
+        .mark_rect(fill="#6abf69", stroke="#1e7e34", strokeWidth=3, cornerRadius=6)
+        .encode(
+            x=alt.X("x:Q", scale=alt.Scale(domain=[-25, 25]), axis=None),
+            x2="x2:Q",
+            y=alt.Y("y:Q", scale=alt.Scale(domain=[-12, 42]), axis=None),
+            y2="y2:Q",
+        )
+    )
+
+    layers = [green]
+
+    # Short trouble (approach coming from bottom)
+    h_short = trouble_height_map.get(short_trouble, 0)
+    if h_short > 0:
+        short_df = pd.DataFrame({"x": [-22], "x2": [22], "y": [-h_short], "y2": [0]})
+        short_zone = (
+            alt.Chart(short_df)
+            .mark_rect(fill="#c0392b", opacity=0.35)
+            .encode(x="x:Q", x2="x2:Q", y="y:Q", y2="y2:Q")
+        )
+        layers.append(short_zone)
+
+    # Long trouble (over the green)
+    h_long = trouble_height_map.get(long_trouble, 0)
+    if h_long > 0:
+        long_df = pd.DataFrame({"x": [-22], "x2": [22], "y": [30], "y2": [30 + h_long]})
+        long_zone = (
+            alt.Chart(long_df)
+            .mark_rect(fill="#c0392b", opacity=0.35)
+            .encode(x="x:Q", x2="x2:Q", y="y:Q", y2="y2:Q")
+        )
+        layers.append(long_zone)
+
+    # Left trouble
+    h_left = trouble_height_map.get(left_trouble, 0)
+    if h_left > 0:
+        left_df = pd.DataFrame(
+            {"x": [-15 - h_left], "x2": [-15], "y": [-10], "y2": [40]}
+        )
+        left_zone = (
+            alt.Chart(left_df)
+            .mark_rect(fill="#c0392b", opacity=0.35)
+            .encode(x="x:Q", x2="x2:Q", y="y:Q", y2="y2:Q")
+        )
+        layers.append(left_zone)
+
+    # Right trouble
+    h_right = trouble_height_map.get(right_trouble, 0)
+    if h_right > 0:
+        right_df = pd.DataFrame(
+            {"x": [15], "x2": [15 + h_right], "y": [-10], "y2": [40]}
+        )
+        right_zone = (
+            alt.Chart(right_df)
+            .mark_rect(fill="#c0392b", opacity=0.35)
+            .encode(x="x:Q", x2="x2:Q", y="y:Q", y2="y2:Q")
+        )
+        layers.append(right_zone)
+
+    # Pin position
+    pin_y_map = {"Front": 7, "Middle": 15, "Back": 23}
+    pin_y = pin_y_map.get(pin_location, 15)
+    pin_df = pd.DataFrame({"x": [0], "y": [pin_y]})
+
+    pin = (
+        alt.Chart(pin_df)
+        .mark_point(size=180, color="#2c3e50", filled=True)
+        .encode(x="x:Q", y="y:Q")
+    )
+    layers.append(pin)
+
+    return (
+        alt.layer(*layers)
+        .properties(
+            width=520,
+            height=220,
+            title=alt.TitleParams(
+                "Green Overview",
+                subtitle=f"Pin: {pin_location} • Strategy: {strategy_label}",
+                fontSize=16,
+                anchor="middle",
+            ),
+        )
+        .configure_view(stroke=None, fill="#05070b")
+        .configure_title(color="#f5f5f5")
+        .to_dict()
+    )
+
+
+# 3.1 Plays-like gauge
+def draw_plays_like_gauge(raw_yards, plays_like):
+    # Plotly is only needed for this gauge; import it on first use so a
+    # cold start (and Tournament/Range-only sessions) skip loading it.
+    import plotly.graph_objects as go
+
+    delta = plays_like - raw_yards
+    color = "red" if delta > 0 else "blue" if delta < 0 else "gray"
+
+    fig = go.Figure(
+        go.Indicator(
+            mode="gauge+number+delta",
+            value=plays_like,
+            domain={"x": [0, 1], "y": [0, 1]},
+            title={
+                "text": f"<b>Plays-Like: {plays_like:.0f} yards</b>",
+                "font": {"size": 20},
+            },
+            delta={
+                "reference": raw_yards,
+                "relative": False,
+                "position": "top",
+            },
+            gauge={
+                "axis": {
+                    "range": [raw_yards - 40, raw_yards + 40],
+                    "tickwidth": 2,
+                },
+                "bar": {"color": color},
+                "steps": [
+                    {
+                        "range": [raw_yards - 40, raw_yards],
+                        "color": "lightcyan",
+                    },
+                    {
+                        "range": [raw_yards, raw_yards + 40],
+                        "color": "mistyrose",
+                    },
+                ],
+                "threshold": {
+                    "line": {"color": "red", "width": 4},
+                    "thickness": 0.8,
+                    "value": raw_yards,
+                },
+            },
+        )
+    )
+    fig.update_layout(
+        height=280, margin=dict(t=60, b=10, l=10, r=10)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# Unit circle shared by all shot-window ellipses (not rebuilt per panel)
+_THETA = np.linspace(0, 2 * np.pi, 200)
+_UNIT_COS = np.cos(_THETA)
+_UNIT_SIN = np.sin(_THETA)
+
+
+# 3.2 Top-5 dispersion “bands” in a row
+def draw_shot_windows(recommendations, plays_like_yards: float, skill_factor: float = 1.0):
+    """
+    Compact, 'launch monitor' style view of dispersion for the top recommendations.
+    Uses smooth ellipses instead of random dots, with a horizontal line at the
+    plays-like yardage.
+    """
+    if not recommendations:
+        return
+
+    # Take the top 4 options to avoid clutter
+    top = recommendations[:4]
+
+    # Shared by every panel: the pin line depends only on plays-like yards
+    pin_line_df = pd.DataFrame({"y": [plays_like_yards]})
+
+    charts = []
+    for shot in top:
+        center_y = shot["total"]          # total distance in yards
+        cat = shot.get("category", "mid_iron")
+
+        # Depth & lateral sigmas from engine helpers
+        sigma_depth = sge.get_dispersion_sigma(cat) * skill_factor
+        sigma_lat = sge.get_lateral_sigma(cat) * skill_factor
+
+        # Scale the precomputed unit circle into this shot's ellipse
+        ellipse_df = pd.DataFrame({
+            "x": sigma_lat * _UNIT_COS,
+            "y": center_y + sigma_depth * _UNIT_SIN,
+        })
+
+        center_df = pd.DataFrame({"x": [0.0], "y": [center_y]})
+
+        ellipse_fill = (
+            alt.Chart(ellipse_df)
+            .mark_area(
+                opacity=0.22,
+                color="#3498db",
+            )
+            .encode(
+                x=alt.X("x:Q", scale=alt.Scale(domain=[-30, 30]), axis=None),
+                y=alt.Y(
+                    "y:Q",
+                    scale=alt.Scale(
+                        domain=[plays_like_yards - 40, plays_like_yards + 40]
+                    ),
+                    axis=None,
+                ),
+            )
+        )
+
+        ellipse_outline = (
+            alt.Chart(ellipse_df)
+            .mark_line(color="#5dade2", strokeWidth=2)
+            .encode(x="x:Q", y="y:Q")
+        )
+
+        pin_line = (
+            alt.Chart(pin_line_df)
+            .mark_rule(color="#ecf0f1", strokeDash=[6, 4], strokeWidth=2)
+            .encode(y="y:Q")
+        )
+
+        center_point = (
+            alt.Chart(center_df)
+            .mark_point(size=40, color="white")
+            .encode(x="x:Q", y="y:Q")
+        )
+
+        title = f"{shot['club']} — {shot['shot_type']}"
+        subtitle = f"Total ≈ {shot['total']:.0f} • SG {shot['sg']:+.2f}"
+
+        chart = (
+            alt.layer(ellipse_fill, ellipse_outline, pin_line, center_point)
+            .properties(
+                width=160,
+                height=240,
+                title=alt.TitleParams(
+                    title,
+                    subtitle=subtitle,
+                    fontSize=13,
+                    anchor="middle",
+                ),
+            )
+        )
+
+        charts.append(chart)
+
+    if not charts:
+        return
+
+    combo = alt.hconcat(*charts, spacing=16)
+    combo = (
+        combo
+        .configure_view(stroke=None, fill="#05070b")
+        .configure_title(color="#f5f5f5")
+    )
+    st.markdown("### Shot Windows vs Plays-Like")
+    st.altair_chart(combo, use_container_width=True)
+
+
+# 3.3 Green overview map
+def draw_green_overview(short_trouble, long_trouble,
+                        left_trouble, right_trouble,
+                        pin_location, strategy_label: str = "Balanced"):
+    """
+    Clean aerial-style green overview with trouble zones and pin position.
+    """
+    spec = _green_overview_spec(
+        short_trouble, long_trouble, left_trouble, right_trouble,
+        pin_location, strategy_label,
+    )
+    st.markdown("### Green Overview")
+    st.vega_lite_chart(spec, use_container_width=True)
+
+
+# Color-coded risk meter, pre-rendered once per risk level
+_RISK_METER_HTML = """
+<div style="margin-top:0.1rem; margin-bottom:0.4rem;
+            font-size:0.9rem;">
+    {icon}
+    <span style="color:{color}; font-weight:600;">
+        {label}
+    </span>
+    <span style="color:#aaaaaa;">
+    </span>
+</div>
+"""
+_RISK_METERS = {
+    level: _RISK_METER_HTML.format(icon=icon, label=label, color=color)
+    for level, icon, label, color in (
+        ("low", "🟢", "Low Risk", "#2ecc71"),
+        ("medium", "🟡", "Medium Risk", "#f1c40f"),
+        ("high", "🔴", "High Risk", "#e74c3c"),
+    )
+}
+
+
+def _render_recommendations(ranked, target_pin, target_final, skill_factor,
+                            trouble_short_label, trouble_long_label,
+                            left_trouble_label, right_trouble_label,
+                            pin_location, strategy_label):
+    """
+    Recommended options list plus the visual pack (gauge, shot windows,
+    green overview). Holds no widgets, so it redraws with the full rerun
+    from a Caddy submit or from the stored last_caddy result.
+    """
+    st.subheader("Recommended Options")
+
+    # Sigmas / side-miss odds come from the engine (fairway lie in Caddy mode)
+    side_safe = 12.0  # yards off-line we treat as “okay” around the green
+
+    for i, s in enumerate(ranked, start=1):
+        # --- Core line: what the shot is ---
+        st.markdown(
+            f"**{i}. {s['club']} — {s['shot_type']}**  "
+            f"(Carry ≈ {s['carry']:.1f} yds, "
+            f"Total ≈ {s['total']:.1f} yds, "
+            f"SG ≈ {s['sg']:.3f})"
+        )
+        st.caption(s["reason"])
+
+        # --- Probabilities from the same model as the engine ---
+
+        diff = s["diff"]
+        # Depth dispersion (yards), as used by the engine for this shot
+        sigma_depth = s["sigma_depth"]
+
+        # 1) Within ±5 yds (depth) – already computed in engine as p_close
+        p_close = _clip01(s.get("p_close", 0.0))
+
+        # 2) Short vs long probabilities (depth)
+        #    Model Y ~ N(mu=diff, sigma=sigma_depth), where Y > 0 => long
+        p_short = _clip01(sge._normal_cdf(0.0, diff, sigma_depth))
+        p_long = _clip01(1.0 - p_short)
+
+        # 3) Side miss probability beyond ±side_safe (engine, same side_safe)
+        #    Symmetric around 0, so left/right split is 50/50
+        p_side_miss = _clip01(s["p_side_miss"])
+
+        # Map side-miss into *actual trouble* if any is marked
+        p_into_trouble = 0.0
+        trouble_side_label = None
+
+        has_left_trouble = left_trouble_label != "None"
+        has_right_trouble = right_trouble_label != "None"
+
+        if has_left_trouble and has_right_trouble:
+            # Any big side miss is bad
+            p_into_trouble = p_side_miss
+            trouble_side_label = "left or right"
+        elif has_left_trouble:
+            p_into_trouble = 0.5 * p_side_miss
+            trouble_side_label = "left"
+        elif has_right_trouble:
+            p_into_trouble = 0.5 * p_side_miss
+            trouble_side_label = "right"
+
+        p_into_trouble = _clip01(p_into_trouble)
+
+        # --- Overall risk score & color-coded meter ---
+
+        # Depth risk = how often you’re NOT within ±5 yds
+        depth_risk = 1.0 - p_close
+        # Trouble risk = probability you actually find trouble (0 if no trouble set)
+        trouble_risk = p_into_trouble
+
+        # Weight trouble more heavily than depth miss
+        total_risk = 0.6 * trouble_risk + 0.4 * depth_risk
+
+        if total_risk < 0.25:
+            risk_meter = _RISK_METERS["low"]
+        elif total_risk < 0.5:
+            risk_meter = _RISK_METERS["medium"]
+        else:
+            risk_meter = _RISK_METERS["high"]
+
+        # --- Render probabilities (neutral) ---
+        probs_lines = [
+            f"- Within ±5 yds (depth): **{p_close * 100:.0f}%**",
+            f"- Miss Pattern Depth: **{p_short * 100:.0f}% short** / "
+            f"**{p_long * 100:.0f}% long**",
+        ]
+        if trouble_side_label is not None:
+            probs_lines.append(
+                f"- Side miss into **{trouble_side_label} trouble** "
+                f"(beyond ~{side_safe:.0f} yds): "
+                f"**{p_into_trouble * 100:.0f}%**"
+            )
+
+        st.markdown("\n".join(probs_lines))
+
+        # --- Color-coded risk meter line ---
+        st.markdown(risk_meter, unsafe_allow_html=True)
+
+        st.markdown("---")
+
+    # --------------------------------------------------------
+    # VISUAL PACK: Gauge + Top-5 grid + Green overview
+    # --------------------------------------------------------
+    st.markdown("---")
+    draw_plays_like_gauge(target_pin, target_final)
+    draw_shot_windows(ranked, target_final, skill_factor=skill_factor)
+    draw_green_overview(
+        trouble_short_label,
+        trouble_long_label,
+        left_trouble_label,
+        right_trouble_label,
+        pin_location,
+        strategy_label=strategy_label,
+    )
+
+
 # ------------------------------------------------------------
 # Tabs
 # ------------------------------------------------------------
@@ -322,42 +931,7 @@ with tab_play:
         )
 
         st.markdown("### Full-Bag Yardages (Scaled to Your Driver Speed)")
-        df_full = pd.DataFrame(full_bag)
-        df_full["Ball Speed (mph)"] = df_full["Ball Speed (mph)"].round(1)
-        df_full["Carry (yds)"] = df_full["Carry (yds)"].round(0)
-        df_full["Total (yds)"] = df_full["Total (yds)"].round(0)
-
-        dispersion_list = []
-        for _, row in df_full.iterrows():
-            club = row["Club"]
-            category = _category_for_club(club)
-            sigma = sge.get_dispersion_sigma(category)
-            dispersion_list.append(sigma)
-
-        df_full["Dispersion (±yds)"] = dispersion_list
-        df_full = df_full[
-            [
-                "Club",
-                "Carry (yds)",
-                "Total (yds)",
-                "Dispersion (±yds)",
-                "Ball Speed (mph)",
-                "Launch (°)",
-                "Spin (rpm)",
-            ]
-        ]
-        df_full = df_full.reset_index(drop=True)
-        st.dataframe(df_full, use_container_width=True)
-
-        st.markdown("### Scoring Wedge / Partial Shot Yardages")
-        df_score = pd.DataFrame(scoring_shots)
-        df_score = df_score[["carry", "club", "shot_type", "trajectory"]]
-        df_score.columns = ["Carry (yds)", "Club", "Shot Type", "Trajectory"]
-        df_score["Carry (yds)"] = df_score["Carry (yds)"].round(0)
-        df_score = df_score.sort_values("Carry (yds)", ascending=False).reset_index(
-            drop=True
-        )
-        st.dataframe(df_score, use_container_width=True)
+        _render_bag_tables(driver_speed, "### Scoring Wedge / Partial Shot Yardages")
 
     else:
         # ----------------------------------------------------
@@ -384,613 +958,210 @@ with tab_play:
         green_firmness_label = "Medium"
 
 
-        # Core inputs
-        pin_col1, pin_col2 = st.columns([2, 1])
-        with pin_col1:
-            target_pin = st.number_input(
-                "Pin Yardage (yards)",
-                min_value=10.0,
-                max_value=300.0,
-                value=150.0,
-                step=1.0,
-                help="Measured distance to the flag from your current position.",
-            )
-        with pin_col2:
-            st.write("")
-            st.write("")
-            st.markdown("**Core Shot Inputs**")
-
-        col_a, col_b, col_c = st.columns(3)
-
-        with col_a:
-            wind_dir_label = st.selectbox(
-                "Wind Direction",
-                ["None", "Into", "Down", "Cross"],
-                help="Direction the wind is blowing relative to your target.",
-            )
-            wind_strength_label = st.radio(
-                "Wind Strength",
-                ["None", "Light", "Medium", "Heavy"],
-                horizontal=True,
-                help="Stronger winds have a bigger impact on the plays-as yardage.",
-            )
-
-        with col_b:
-            lie_label = st.radio(
-                "Ball Lie",
-                ["Good", "Ok", "Bad"],
-                horizontal=True,
-                help="Good = fairway/tee, Ok = light rough or small slope, Bad = heavy rough or poor stance.",
-            )
-            elevation_label = st.selectbox(
-                "Elevation to Target",
-                ["Flat", "Slight Uphill", "Moderate Uphill",
-                 "Slight Downhill", "Moderate Downhill"],
-                help="Relative height difference between you and the target.",
-            )
-
-        with col_c:
-            if mode == "Advanced":
-                st.markdown("**Strategy & Player Profile**")
-                use_auto_strategy = st.checkbox(
-                    "Auto-select strategy based on situation",
-                    value=True,
+        # Inputs are batched in a form so edits only rerun on submit
+        with st.form("caddy_inputs", clear_on_submit=False):
+            # Core inputs
+            pin_col1, pin_col2 = st.columns([2, 1])
+            with pin_col1:
+                target_pin = st.number_input(
+                    "Pin Yardage (yards)",
+                    min_value=10.0,
+                    max_value=300.0,
+                    value=150.0,
+                    step=1.0,
+                    help="Measured distance to the flag from your current position.",
                 )
-                manual_strategy = st.radio(
-                    "Strategy",
-                    [sge.STRATEGY_BALANCED, sge.STRATEGY_CONSERVATIVE, sge.STRATEGY_AGGRESSIVE],
-                    index=0,
-                    help="Conservative favors safety, Aggressive chases pins, Balanced is in between.",
+            with pin_col2:
+                st.write("")
+                st.write("")
+                st.markdown("**Core Shot Inputs**")
+
+            col_a, col_b, col_c = st.columns(3)
+
+            with col_a:
+                wind_dir_label = st.selectbox(
+                    "Wind Direction",
+                    ["None", "Into", "Down", "Cross"],
+                    help="Direction the wind is blowing relative to your target.",
                 )
-                if not use_auto_strategy:
-                    strategy_label = manual_strategy
-            else:
-                st.markdown("**Strategy**")
-                st.caption(
-                    "Quick mode uses a balanced strategy with moderate risk/reward."
+                wind_strength_label = st.radio(
+                    "Wind Strength",
+                    ["None", "Light", "Medium", "Heavy"],
+                    horizontal=True,
+                    help="Stronger winds have a bigger impact on the plays-as yardage.",
                 )
 
-
-        # Advanced-only extras
-        if mode == "Advanced":
-            with st.expander("Advanced: Trouble, Green, Tendencies (Optional)"):
-                st.subheader("**Trouble Short / Long & Green Firmness**")
-                col1, col2, col3 = st.columns(3)
-                trouble_short_label = col1.selectbox(
-                    "Trouble Short?",
-                    ["None", "Mild", "Severe"],
-                    index=0,
-                )
-                trouble_long_label = col2.selectbox(
-                    "Trouble Long?",
-                    ["None", "Mild", "Severe"],
-                    index=0,
+            with col_b:
+                lie_label = st.radio(
+                    "Ball Lie",
+                    ["Good", "Ok", "Bad"],
+                    horizontal=True,
+                    help="Good = fairway/tee, Ok = light rough or small slope, Bad = heavy rough or poor stance.",
                 )
-                left_trouble_label = col3.selectbox(
-                    "Trouble Left?",
-                    ["None", "Mild", "Severe"],
-                    index=0,
-                    key="play_trouble_left",
+                elevation_label = st.selectbox(
+                    "Elevation to Target",
+                    ["Flat", "Slight Uphill", "Moderate Uphill",
+                     "Slight Downhill", "Moderate Downhill"],
+                    help="Relative height difference between you and the target.",
                 )
 
-                col4, col5, col6 = st.columns(3)
-                right_trouble_label = col4.selectbox(
-                    "Trouble Right?",
-                    ["None", "Mild", "Severe"],
-                    index=0,
-                    key="play_trouble_right",
-                )
-                pin_location = col5.selectbox(
-                    "Pin Depth",
-                    ["Front", "Middle", "Back"],
-                    index=1,
-                )
+            with col_c:
+                if mode == "Advanced":
+                    st.markdown("**Strategy & Player Profile**")
+                    use_auto_strategy = st.checkbox(
+                        "Auto-select strategy based on situation",
+                        value=True,
+                    )
+                    manual_strategy = st.radio(
+                        "Strategy",
+                        [sge.STRATEGY_BALANCED, sge.STRATEGY_CONSERVATIVE, sge.STRATEGY_AGGRESSIVE],
+                        index=0,
+                        help="Conservative favors safety, Aggressive chases pins, Balanced is in between.",
+                    )
+                    if not use_auto_strategy:
+                        strategy_label = manual_strategy
+                else:
+                    st.markdown("**Strategy**")
+                    st.caption(
+                        "Quick mode uses a balanced strategy with moderate risk/reward."
+                    )
 
-                st.markdown("---")
-                st.markdown("**Player Tendencies**")
-                tendency = st.radio(
-                    "Usual Miss (Distance)",
-                    ["Neutral", "Usually Short", "Usually Long"],
-                    horizontal=True,
-                    index=["Neutral", "Usually Short", "Usually Long"].index(
-                        st.session_state.tendency
-                    ),
-                    help="If you typically come up short or long, the target can be biased slightly.",
-                )
-                st.session_state.tendency = tendency
 
-                skill = st.radio(
-                    "Ball Striking Consistency",
-                    ["Recreational", "Intermediate", "Highly Consistent"],
-                    index=["Recreational", "Intermediate", "Highly Consistent"].index(skill),
-                    help="Used to scale dispersion windows and strokes-gained simulations.",
-                )
-                st.session_state.skill = skill
-        
-        else:
-        # Quick defaults
-            trouble_short_label = "None"
-            trouble_long_label = "None"
-            left_trouble_label = "None"
-            right_trouble_label = "None"
-            pin_location = "Middle"
-            strategy_label = sge.STRATEGY_BALANCED
-            tendency = "Neutral"
-
-        # Skill factor (used for SG and dispersion scaling)
-        skill_norm = skill.lower()
-        if skill_norm == "recreational":
-            skill_factor = 1.3
-        elif skill_norm == "highly consistent":
-            skill_factor = 0.8
-        else:
-            skill_factor = 1.0
+            # Advanced-only extras
+            if mode == "Advanced":
+                with st.expander("Advanced: Trouble, Green, Tendencies (Optional)"):
+                    st.subheader("**Trouble Short / Long & Green Firmness**")
+                    col1, col2, col3 = st.columns(3)
+                    trouble_short_label = col1.selectbox(
+                        "Trouble Short?",
+                        _TROUBLE_LEVELS,
+                        index=0,
+                    )
+                    trouble_long_label = col2.selectbox(
+                        "Trouble Long?",
+                        _TROUBLE_LEVELS,
+                        index=0,
+                    )
+                    left_trouble_label = col3.selectbox(
+                        "Trouble Left?",
+                        _TROUBLE_LEVELS,
+                        index=0,
+                        key="play_trouble_left",
+                    )
 
-        # Combine with handicap factor
-        sg_profile_factor = st.session_state.handicap_factor
-        skill_factor *= st.session_state.handicap_factor
+                    col4, col5, col6 = st.columns(3)
+                    right_trouble_label = col4.selectbox(
+                        "Trouble Right?",
+                        _TROUBLE_LEVELS,
+                        index=0,
+                        key="play_trouble_right",
+                    )
+                    pin_location = col5.selectbox(
+                        "Pin Depth",
+                        ["Front", "Middle", "Back"],
+                        index=1,
+                    )
 
-        # Normalize for logic
-        wind_dir = wind_dir_label.lower()
-        wind_strength = wind_strength_label.lower()
-        lie = lie_label.lower()
+                    st.markdown("---")
+                    st.markdown("**Player Tendencies**")
+                    tendency = st.radio(
+                        "Usual Miss (Distance)",
+                        _TENDENCIES,
+                        horizontal=True,
+                        index=_TENDENCY_IDX[st.session_state.tendency],
+                        help="If you typically come up short or long, the target can be biased slightly.",
+                    )
 
-        if st.button("Suggest Shots ✅"):
-            with st.spinner("Crunching the numbers..."):
+                    skill = st.radio(
+                        "Ball Striking Consistency",
+                        _SKILLS,
+                        index=_SKILL_IDX[skill],
+                        help="Used to scale dispersion windows and strokes-gained simulations.",
+                    )
 
-                # Plays-like yardage using shared engine helpers
-                target_after_wind = sge.adjust_for_wind(
-                    target_pin, wind_dir, wind_strength
-                )
-                target_after_elev = sge.apply_elevation(
-                    target_after_wind, elevation_label
-                )
-                target_final = sge.apply_lie(target_after_elev, lie)
+            else:
+            # Quick defaults
+                trouble_short_label = "None"
+                trouble_long_label = "None"
+                left_trouble_label = "None"
+                right_trouble_label = "None"
+                pin_location = "Middle"
+                strategy_label = sge.STRATEGY_BALANCED
+                tendency = "Neutral"
+
+            submitted = st.form_submit_button("Suggest Shots ✅")
+
+        # Skill factor (used for SG and dispersion scaling), combined with handicap
+        sg_profile_factor = st.session_state.handicap_factor
+        skill_factor = _SKILL_FACTOR.get(skill, 1.0) * sg_profile_factor
 
-                # Tendency bias
-                if tendency == "Usually Short":
-                    target_final += 3.0
-                elif tendency == "Usually Long":
-                    target_final -= 3.0
+        if submitted:
+            if mode == "Advanced":
+                st.session_state.tendency = tendency
+                st.session_state.skill = skill
+
+            with st.spinner("Crunching the numbers..."):
 
-                st.markdown(
-                    f"### Adjusted Target (plays like): **{target_final:.1f} yds**"
+                # Plays-like yardage via the shared engine calculator
+                # (wind -> elevation -> lie -> tendency, no temperature here)
+                target_final = sge.calculate_plays_like_yardage(
+                    raw_yards=target_pin,
+                    wind_dir=wind_dir_label,
+                    wind_strength_label=wind_strength_label,
+                    elevation_label=elevation_label,
+                    lie_label=lie_label,
+                    tendency_label=tendency,
                 )
 
                 if use_auto_strategy:
                     # crude auto-strategy: longer shots & heavy trouble → conservative
-                    if target_final > 190 or trouble_long_label == "Severe":
-                        strategy_label = sge.STRATEGY_CONSERVATIVE
-                    elif target_final < 130 and trouble_short_label == "None":
-                        strategy_label = sge.STRATEGY_AGGRESSIVE
-                    else:
-                        strategy_label = sge.STRATEGY_BALANCED
-
-                st.caption(f"Using Strategy: **{strategy_label}**")
-
-                ranked = sge.recommend_shots_with_sg(
-                    target_total=target_final,
-                    candidates=all_shots_base,
-                    short_trouble_label=trouble_short_label,
-                    long_trouble_label=trouble_long_label,
-                    left_trouble_label=left_trouble_label,
-                    right_trouble_label=right_trouble_label,
-                    green_firmness_label=green_firmness_label,
-                    strategy_label=strategy_label,
-                    start_distance_yards=target_pin,
-                    start_surface="fairway",
-                    front_yards=0.0,
-                    back_yards=0.0,
-                    skill_factor=skill_factor,
-                    pin_lateral_offset=0.0,
-                    green_width=0.0,
-                    n_sim=sge.DEFAULT_N_SIM,
-                    top_n=5,
-                    sg_profile_factor=sg_profile_factor,
-                )
-
-                if not ranked:
-                    st.warning(
-                        "No reasonable candidate shots found near this plays-like yardage."
+                    strategy_label = _auto_strategy(
+                        target_final, trouble_short_label, trouble_long_label
                     )
-                else:
-                    st.subheader("Recommended Options")
-
-                    # Lie factor for current situation (you’re hitting from fairway in Caddy mode)
-                    lie_factor_for_visuals = sge.lie_dispersion_factor("fairway")
-                    side_safe = 12.0  # yards off-line we treat as “okay” around the green
-
-                    for i, s in enumerate(ranked, start=1):
-                        # --- Core line: what the shot is ---
-                        st.markdown(
-                            f"**{i}. {s['club']} — {s['shot_type']}**  "
-                            f"(Carry ≈ {s['carry']:.1f} yds, "
-                            f"Total ≈ {s['total']:.1f} yds, "
-                            f"SG ≈ {s['sg']:.3f})"
-                        )
-                        st.caption(s["reason"])
-
-                        # --- Probabilities from the same model as the engine ---
-
-                        cat = s.get("category", "mid_iron")
-                        diff = s.get("diff", s["total"] - target_final)
-
-                        # Depth dispersion (yards)
-                        sigma_depth = (
-                            sge.get_dispersion_sigma(cat)
-                            * skill_factor
-                            * lie_factor_for_visuals
-                        )
-
-                        # Lateral dispersion (yards)
-                        sigma_lat = (
-                            sge.get_lateral_sigma(cat)
-                            * skill_factor
-                            * lie_factor_for_visuals
-                        )
-
-                        # 1) Within ±5 yds (depth) – already computed in engine as p_close
-                        p_close = _clip01(s.get("p_close", 0.0))
-
-                        # 2) Short vs long probabilities (depth)
-                        #    Model Y ~ N(mu=diff, sigma=sigma_depth), where Y > 0 => long
-                        p_short = _clip01(sge._normal_cdf(0.0, diff, sigma_depth))
-                        p_long = _clip01(1.0 - p_short)
-
-                        # 3) Side miss probability beyond ±side_safe
-                        #    Symmetric around 0, so left/right split is 50/50
-                        p_side_miss = 1.0 - (
-                            sge._normal_cdf(side_safe, 0.0, sigma_lat)
-                            - sge._normal_cdf(-side_safe, 0.0, sigma_lat)
-                        )
-                        p_side_miss = _clip01(p_side_miss)
-
-                        # Map side-miss into *actual trouble* if any is marked
-                        p_into_trouble = 0.0
-                        trouble_side_label = None
-
-                        has_left_trouble = left_trouble_label != "None"
-                        has_right_trouble = right_trouble_label != "None"
-
-                        if has_left_trouble and has_right_trouble:
-                            # Any big side miss is bad
-                            p_into_trouble = p_side_miss
-                            trouble_side_label = "left or right"
-                        elif has_left_trouble:
-                            p_into_trouble = 0.5 * p_side_miss
-                            trouble_side_label = "left"
-                        elif has_right_trouble:
-                            p_into_trouble = 0.5 * p_side_miss
-                            trouble_side_label = "right"
-
-                        p_into_trouble = _clip01(p_into_trouble)
-
-                        # --- Overall risk score & color-coded meter ---
-
-                        # Depth risk = how often you’re NOT within ±5 yds
-                        depth_risk = 1.0 - p_close
-                        # Trouble risk = probability you actually find trouble (0 if no trouble set)
-                        trouble_risk = p_into_trouble
-
-                        # Weight trouble more heavily than depth miss
-                        total_risk = 0.6 * trouble_risk + 0.4 * depth_risk
-
-                        if total_risk < 0.25:
-                            risk_icon = "🟢"
-                            risk_label = "Low Risk"
-                            risk_color = "#2ecc71"
-                        elif total_risk < 0.5:
-                            risk_icon = "🟡"
-                            risk_label = "Medium Risk"
-                            risk_color = "#f1c40f"
-                        else:
-                            risk_icon = "🔴"
-                            risk_label = "High Risk"
-                            risk_color = "#e74c3c"
-
-                        # --- Render probabilities (neutral) ---
-                        probs_lines = [
-                            f"- Within ±5 yds (depth): **{p_close * 100:.0f}%**",
-                            f"- Miss Pattern Depth: **{p_short * 100:.0f}% short** / "
-                            f"**{p_long * 100:.0f}% long**",
-                        ]
-                        if trouble_side_label is not None:
-                            probs_lines.append(
-                                f"- Side miss into **{trouble_side_label} trouble** "
-                                f"(beyond ~{side_safe:.0f} yds): "
-                                f"**{p_into_trouble * 100:.0f}%**"
-                            )
-
-                        st.markdown("\n".join(probs_lines))
-
-                        # --- Color-coded risk meter line ---
-                        st.markdown(
-                            f"""
-                            <div style="margin-top:0.1rem; margin-bottom:0.4rem;
-                                        font-size:0.9rem;">
-                                {risk_icon}
-                                <span style="color:{risk_color}; font-weight:600;">
-                                    {risk_label}
-                                </span>
-                                <span style="color:#aaaaaa;">
-                                </span>
-                            </div>
-                            """,
-                            unsafe_allow_html=True,
-                        )
-
-                        st.markdown("---")
-
-
-                                       # --------------------------------------------------------
-                    # VISUAL PACK: Gauge + Top-5 grid + Green overview
-                    # --------------------------------------------------------
-
-                    # 3.1 Plays-like gauge
-                    def draw_plays_like_gauge(raw_yards, plays_like):
-                        delta = plays_like - raw_yards
-                        color = "red" if delta > 0 else "blue" if delta < 0 else "gray"
-
-                        fig = go.Figure(
-                            go.Indicator(
-                                mode="gauge+number+delta",
-                                value=plays_like,
-                                domain={"x": [0, 1], "y": [0, 1]},
-                                title={
-                                    "text": f"<b>Plays-Like: {plays_like:.0f} yards</b>",
-                                    "font": {"size": 20},
-                                },
-                                delta={
-                                    "reference": raw_yards,
-                                    "relative": False,
-                                    "position": "top",
-                                },
-                                gauge={
-                                    "axis": {
-                                        "range": [raw_yards - 40, raw_yards + 40],
-                                        "tickwidth": 2,
-                                    },
-                                    "bar": {"color": color},
-                                    "steps": [
-                                        {
-                                            "range": [raw_yards - 40, raw_yards],
-                                            "color": "lightcyan",
-                                        },
-                                        {
-                                            "range": [raw_yards, raw_yards + 40],
-                                            "color": "mistyrose",
-                                        },
-                                    ],
-                                    "threshold": {
-                                        "line": {"color": "red", "width": 4},
-                                        "thickness": 0.8,
-                                        "value": raw_yards,
-                                    },
-                                },
-                            )
-                        )
-                        fig.update_layout(
-                            height=280, margin=dict(t=60, b=10, l=10, r=10)
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-
-                    # 3.2 Top-5 dispersion “bands” in a row
-                    def draw_shot_windows(recommendations, plays_like_yards: float, skill_factor: float = 1.0):
-                        """
-                        Compact, 'launch monitor' style view of dispersion for the top recommendations.
-                        Uses smooth ellipses instead of random dots, with a horizontal line at the
-                        plays-like yardage.
-                        """
-                        if not recommendations:
-                            return
-
-                        # Take the top 4 options to avoid clutter
-                        top = recommendations[:4]
-
-                        charts = []
-                        for shot in top:
-                            center_y = shot["total"]          # total distance in yards
-                            cat = shot.get("category", "mid_iron")
-
-        # Depth & lateral sigmas from engine helpers
-                            sigma_depth = sge.get_dispersion_sigma(cat) * skill_factor
-                            sigma_lat = sge.get_lateral_sigma(cat) * skill_factor
-
-        # Build a parametric ellipse
-                            theta = np.linspace(0, 2 * np.pi, 200)
-                            ellipse_df = pd.DataFrame({
-                                "x": sigma_lat * np.cos(theta),
-                                "y": center_y + sigma_depth * np.sin(theta),
-                            })
-
-                            center_df = pd.DataFrame({"x": [0.0], "y": [center_y]})
-                            pin_line_df = pd.DataFrame({"y": [plays_like_yards]})
-
-                            ellipse_fill = (
-                                alt.Chart(ellipse_df)
-                                .mark_area(
-                                    opacity=0.22,
-                                    color="#3498db",
-                                )
-                                .encode(
-                                    x=alt.X("x:Q", scale=alt.Scale(domain=[-30, 30]), axis=None),
-                                    y=alt.Y(
-                                        "y:Q",
-                                        scale=alt.Scale(
-                                            domain=[plays_like_yards - 40, plays_like_yards + 40]
-                                        ),
-                                        axis=None,
-                                    ),
-                                )
-                            )
-
-                            ellipse_outline = (
-                                alt.Chart(ellipse_df)
-                                .mark_line(color="#5dade2", strokeWidth=2)
-                                .encode(x="x:Q", y="y:Q")
-                            )
-
-                            pin_line = (
-                                alt.Chart(pin_line_df)
-                                .mark_rule(color="#ecf0f1", strokeDash=[6, 4], strokeWidth=2)
-                                .encode(y="y:Q")
-                            )
-
-                            center_point = (
-                                alt.Chart(center_df)
-                                .mark_point(size=40, color="white")
-                                .encode(x="x:Q", y="y:Q")
-                            )
-
-                            title = f"{shot['club']} — {shot['shot_type']}"
-                            subtitle = f"Total ≈ {shot['total']:.0f} • SG {shot['sg']:+.2f}"
-
-                            chart = (
-                                alt.layer(ellipse_fill, ellipse_outline, pin_line, center_point)
-                                .properties(
-                                    width=160,
-                                    height=240,
-                                    title=alt.TitleParams(
-                                        title,
-                                        subtitle=subtitle,
-                                        fontSize=13,
-                                        anchor="middle",
-                                    ),
-                                )
-                            )
-
-                            charts.append(chart)
-
-                        if not charts:
-                            return
-
-                        combo = alt.hconcat(*charts, spacing=16)
-                        combo = (
-                            combo
-                            .configure_view(stroke=None, fill="#05070b")
-                            .configure_title(color="#f5f5f5")
-                        )
-                        st.markdown("### Shot Windows vs Plays-Like")
-                        st.altair_chart(combo, use_container_width=True)
-
-                    # 3.3 Green overview map
-                    def draw_green_overview(short_trouble, long_trouble,
-                        left_trouble, right_trouble,
-                        pin_location, strategy_label: str = "Balanced"):
-                        """
-                        Clean aerial-style green overview with trouble zones and pin position.
-                        """
-                        trouble_height_map = {"None": 0, "Mild": 8, "Severe": 14}
 
-    # Base green rectangle
-                        green_df = pd.DataFrame({"x": [-15], "x2": [15], "y": [0], "y2": [30]})
-                        green = (
-                            alt.Chart(green_df)
-                            .mark_rect(fill="#6abf69", stroke="#1e7e34", strokeWidth=3, cornerRadius=6)
-                            .encode(
-                                x=alt.X("x:Q", scale=alt.Scale(domain=[-25, 25]), axis=None),
-                                x2="x2:Q",
-                                y=alt.Y("y:Q", scale=alt.Scale(domain=[-12, 42]), axis=None),
-                                y2="y2:Q",
-                            )
-                        )
-
-                        layers = [green]
-
-    # Short trouble (approach coming from bottom)
-                        h_short = trouble_height_map.get(short_trouble, 0)
-                        if h_short > 0:
-                            short_df = pd.DataFrame({"x": [-22], "x2": [22], "y": [-h_short], "y2": [0]})
-                            short_zone = (
-                                alt.Chart(short_df)
-                                .mark_rect(fill="#c0392b", opacity=0.35)
-                                .encode(x="x:Q", x2="x2:Q", y="y:Q", y2="y2:Q")
-                            )
-                            layers.append(short_zone)
-
-    # Long trouble (over the green)
-                        h_long = trouble_height_map.get(long_trouble, 0)
-                        if h_long > 0:
-                            long_df = pd.DataFrame({"x": [-22], "x2": [22], "y": [30], "y2": [30 + h_long]})
-                            long_zone = (
-                                alt.Chart(long_df)
-                                .mark_rect(fill="#c0392b", opacity=0.35)
-                                .encode(x="x:Q", x2="x2:Q", y="y:Q", y2="y2:Q")
-                            )
-                            layers.append(long_zone)
-
-    # Left trouble
-                        h_left = trouble_height_map.get(left_trouble, 0)
-                        if h_left > 0:
-                            left_df = pd.DataFrame(
-                                {"x": [-15 - h_left], "x2": [-15], "y": [-10], "y2": [40]}
-                            )
-                            left_zone = (
-                                alt.Chart(left_df)
-                                .mark_rect(fill="#c0392b", opacity=0.35)
-                                .encode(x="x:Q", x2="x2:Q", y="y:Q", y2="y2:Q")
-                            )
-                            layers.append(left_zone)
+                ranked = _cached_recommend(
+                    driver_speed,
+                    target_final,
+                    target_pin,
+                    trouble_short_label,
+                    trouble_long_label,
+                    left_trouble_label,
+                    right_trouble_label,
+                    green_firmness_label,
+                    strategy_label,
+                    skill_factor,
+                    sg_profile_factor,
+                )
 
-    # Right trouble
-                        h_right = trouble_height_map.get(right_trouble, 0)
-                        if h_right > 0:
-                            right_df = pd.DataFrame(
-                                {"x": [15], "x2": [15 + h_right], "y": [-10], "y2": [40]}
-                            )
-                            right_zone = (
-                                alt.Chart(right_df)
-                                .mark_rect(fill="#c0392b", opacity=0.35)
-                                .encode(x="x:Q", x2="x2:Q", y="y:Q", y2="y2:Q")
-                            )
-                            layers.append(right_zone)
+            # Keep the result so unrelated reruns redraw it without a re-submit
+            st.session_state.last_caddy = {
+                "ranked": ranked,
+                "target_pin": target_pin,
+                "target_final": target_final,
+                "skill_factor": skill_factor,
+                "trouble_short_label": trouble_short_label,
+                "trouble_long_label": trouble_long_label,
+                "left_trouble_label": left_trouble_label,
+                "right_trouble_label": right_trouble_label,
+                "pin_location": pin_location,
+                "strategy_label": strategy_label,
+            }
+            st.session_state.last_caddy_key = (mode, driver_speed, sg_profile_factor)
+
+        last = st.session_state.last_caddy
+        # Only show a stored result while the bag / handicap it used still apply
+        if last is not None and st.session_state.last_caddy_key == (mode, driver_speed, sg_profile_factor):
+            st.markdown(
+                f"### Adjusted Target (plays like): **{last['target_final']:.1f} yds**"
+            )
+            st.caption(f"Using Strategy: **{last['strategy_label']}**")
 
-    # Pin position
-                        pin_y_map = {"Front": 7, "Middle": 15, "Back": 23}
-                        pin_y = pin_y_map.get(pin_location, 15)
-                        pin_df = pd.DataFrame({"x": [0], "y": [pin_y]})
-
-                        pin = (
-                            alt.Chart(pin_df)
-                            .mark_point(size=180, color="#2c3e50", filled=True)
-                            .encode(x="x:Q", y="y:Q")
-                        )
-                        layers.append(pin)
-
-                        final_chart = (
-                            alt.layer(*layers)
-                            .properties(
-                                width=520,
-                                height=220,
-                                title=alt.TitleParams(
-                                    "Green Overview",
-                                    subtitle=f"Pin: {pin_location} • Strategy: {strategy_label}",
-                                    fontSize=16,
-                                    anchor="middle",
-                                ),
-                            )
-                            .configure_view(stroke=None, fill="#05070b")
-                            .configure_title(color="#f5f5f5")
-                        )
-
-                        st.markdown("### Green Overview")
-                        st.altair_chart(final_chart, use_container_width=True)
-
-
-
-                    # ---- actually draw them ----
-                    st.markdown("---")
-                    draw_plays_like_gauge(target_pin, target_final)
-                    draw_shot_windows(ranked, target_final, skill_factor=skill_factor)
-                    draw_green_overview(
-                        trouble_short_label,
-                        trouble_long_label,
-                        left_trouble_label,
-                        right_trouble_label,
-                        pin_location,
-                        strategy_label=strategy_label,
-                    )
- 
+            if not last["ranked"]:
+                st.warning(
+                    "No reasonable candidate shots found near this plays-like yardage."
+                )
+            else:
+                _render_recommendations(**last)
 
 # ============================================================
 # RANGE TAB
@@ -999,7 +1170,7 @@ with tab_play:
 with tab_range:
     st.subheader("Range Mode:")
 
-    club_options = [row["Club"] for row in full_bag]
+    club_options = list(BAG_BY_CLUB)
     selected_club = st.selectbox("Select Club", club_options)
 
     use_scoring = st.checkbox(
@@ -1007,26 +1178,17 @@ with tab_range:
         value=True,
     )
 
-    df = pd.DataFrame(full_bag)
-    df["Carry (yds)"] = df["Carry (yds)"].round(0)
-    df["Total (yds)"] = df["Total (yds)"].round(0)
+    # Single-row table straight from the club lookup (no full-bag scan)
+    df = pd.DataFrame([BAG_BY_CLUB[selected_club]])
+    round_cols = ["Carry (yds)", "Total (yds)"]
+    df[round_cols] = df[round_cols].round(0)
 
     st.markdown("### Full-Swing Distances")
-    st.dataframe(
-        df[df["Club"] == selected_club].reset_index(drop=True),
-        use_container_width=True,
-    )
+    st.dataframe(df, use_container_width=True)
 
     if use_scoring:
-        df_s = pd.DataFrame(scoring_shots)
-        df_s = df_s[df_s["club"] == selected_club]
-        if not df_s.empty:
-            df_s = df_s[["carry", "club", "shot_type", "trajectory"]]
-            df_s.columns = ["Carry (yds)", "Club", "Shot Type", "Trajectory"]
-            df_s["Carry (yds)"] = df_s["Carry (yds)"].round(0)
-            df_s = df_s.sort_values("Carry (yds)", ascending=False).reset_index(
-                drop=True
-            )
+        df_s = _scoring_by_club(driver_speed).get(selected_club)
+        if df_s is not None:
             st.markdown("### Scoring / Partial Shots")
             st.dataframe(df_s, use_container_width=True)
         else:
@@ -1038,7 +1200,7 @@ with tab_range:
 
         draw_range_dispersion(
             selected_club=selected_club,
-            full_bag=full_bag,
+            bag_by_club=BAG_BY_CLUB,
             skill_label=skill_label,
             handicap_factor=handicap_factor,
         )
@@ -1052,46 +1214,19 @@ with tab_range:
 with tab_yardages:
     st.subheader("Full Bag Yardages:")
 
-    df_full = pd.DataFrame(full_bag)
-    df_full["Carry (yds)"] = df_full["Carry (yds)"].round(0)
-    df_full["Total (yds)"] = df_full["Total (yds)"].round(0)
-    df_full["Ball Speed (mph)"] = df_full["Ball Speed (mph)"].round(1)
-
-    dispersion_list = []
-    for _, row in df_full.iterrows():
-        cat = _category_for_club(row["Club"])
-        dispersion_list.append(sge.get_dispersion_sigma(cat))
-
-    df_full["Dispersion (±yds)"] = dispersion_list
-    df_full = df_full[
-        [
-            "Club",
-            "Carry (yds)",
-            "Total (yds)",
-            "Dispersion (±yds)",
-            "Ball Speed (mph)",
-            "Launch (°)",
-            "Spin (rpm)",
-        ]
-    ]
-    df_full = df_full.reset_index(drop=True)
-    st.dataframe(df_full, use_container_width=True)
-
-    st.markdown("### Scoring / Partial Shot Yardages:")
-    df_score = pd.DataFrame(scoring_shots)
-    df_score = df_score[["carry", "club", "shot_type", "trajectory"]]
-    df_score.columns = ["Carry (yds)", "Club", "Shot Type", "Trajectory"]
-    df_score["Carry (yds)"] = df_score["Carry (yds)"].round(0)
-    df_score = df_score.sort_values("Carry (yds)", ascending=False).reset_index(
-        drop=True
-    )
-    st.dataframe(df_score, use_container_width=True)
+    _render_bag_tables(driver_speed, "### Scoring / Partial Shot Yardages:")
 
 # ============================================================
 # PUTTING TAB
 # ============================================================
 
-with tab_putting:
+# Outcome labels for the probability bars (also the color-scale domain)
+_PUTT_OUTCOMES = ("1-Putt", "2-Putt", "3+ Putt")
+
+
+@st.fragment
+def _render_putting_tab():
+    """Putting tab body; its widgets rerun only this fragment."""
     st.subheader("Putting Prep:")
 
     st.caption(
@@ -1269,34 +1404,43 @@ with tab_putting:
     with col_c:
         st.metric("3-putt %", f"{three_p*100:.1f}%")
 
-    # ---- Compact probability bar chart ----
-    prob_df = pd.DataFrame(
-        {
-            "Outcome": ["1-Putt", "2-Putt", "3+ Putt"],
-            "Probability": [make_p * 100, two_p * 100, three_p * 100],
-        }
-    )
-
-    prob_chart = (
-        alt.Chart(prob_df)
-        .mark_bar(size=50, cornerRadiusTopLeft=6, cornerRadiusTopRight=6)
-        .encode(
-            x=alt.X("Outcome:N", title=""),
-            y=alt.Y("Probability:Q", title="Probability (%)", scale=alt.Scale(domain=[0, 100])),
-            color=alt.Color(
-                "Outcome:N",
-                scale=alt.Scale(
-                    domain=["1-putt", "2-putt", "3+ putt"],
-                    range=["#2ecc71", "#3498db", "#e74c3c"],
-                ),
-                legend=None,
-            ),
-        )
-        .properties(height=260)
-        .configure_view(stroke=None)
-    )
+    # ---- Compact probability bar chart (Vega-Lite spec, no Altair pass) ----
+    prob_spec = {
+        "data": {
+            "values": [
+                {"Outcome": outcome, "Probability": p * 100}
+                for outcome, p in zip(_PUTT_OUTCOMES, (make_p, two_p, three_p))
+            ]
+        },
+        "mark": {
+            "type": "bar",
+            "size": 50,
+            "cornerRadiusTopLeft": 6,
+            "cornerRadiusTopRight": 6,
+        },
+        "encoding": {
+            "x": {"field": "Outcome", "type": "nominal", "title": ""},
+            "y": {
+                "field": "Probability",
+                "type": "quantitative",
+                "title": "Probability (%)",
+                "scale": {"domain": [0, 100]},
+            },
+            "color": {
+                "field": "Outcome",
+                "type": "nominal",
+                "scale": {
+                    "domain": list(_PUTT_OUTCOMES),
+                    "range": ["#2ecc71", "#3498db", "#e74c3c"],
+                },
+                "legend": None,
+            },
+        },
+        "height": 260,
+        "config": {"view": {"stroke": None}},
+    }
 
-    st.altair_chart(prob_chart, use_container_width=True)
+    st.vega_lite_chart(prob_spec, use_container_width=True)
 
     # ---- Mental cue / coaching text ----
     st.markdown("### Mental Takeaway")
@@ -1315,114 +1459,110 @@ with tab_putting:
         "instead of fear mode."
     )
 
+
+with tab_putting:
+    _render_putting_tab()
+
+
 # ============================================================
 # PAR STRATEGY TAB (Hole Strategy)
 # ============================================================
 
+# Result lines, filled straight from the engine's result dicts
+_PAR3_TEE_TMPL = (
+    "**Recommended Tee Shot:** {club} — {shot_type}  "
+    "(Total ≈ {total:.0f} yds, SG vs baseline ≈ {sg:.3f})"
+)
+_PAR3_ODDS_TMPL = (
+    "Approx. Probability on/near Green: Within 10 yds ≈ {p_within_10:.0%}, "
+    "Within 5 yds ≈ {p_within_5:.0%}."
+)
+_TEE_CLUB_TMPL = (
+    "**Tee Club:** {tee_club} "
+    "(Avg Total ≈ {avg_total:.0f} yds, "
+    "Remaining ≈ {remaining_yards:.0f} yds)"
+)
+_PAR4_SCORE_TMPL = (
+    "Expected Score ≈ {expected_score:.2f} "
+    "(SG vs Baseline ≈ {sg_vs_baseline:.3f})."
+)
+
 with tab_strategy:
     st.subheader("Hole Strategy:")
 
-    col_s1, col_s2 = st.columns(2)
-    with col_s1:
-        par_type = st.selectbox("Hole Type", ["Par 3", "Par 4", "Par 5"])
-        hole_yards = st.number_input(
-            "Hole Yardage",
-            min_value=60.0,
-            max_value=650.0,
-            value=420.0 if par_type == "Par 4" else (180.0 if par_type == "Par 3" else 520.0),
-            step=1.0,
-        )
-    with col_s2:
-        fairway_width = st.selectbox(
-            "Fairway Width (for tee shot)", 
-            ["Narrow", "Medium", "Wide"],
-            index=1,
-            key="par_fairway_width"
-        )
-        tee_left_trouble = st.selectbox(
-            "Trouble Left?", 
-            ["None", "Mild", "Severe"], 
-            key="par_tee_left_trouble",
-        )
-        tee_right_trouble = st.selectbox(
-            "Trouble Right?", 
-            ["None", "Mild", "Severe"], 
-             key="par_tee_right_trouble",
-        )
+    # Hole type stays outside the form: it sets the yardage default below
+    par_type = st.selectbox("Hole Type", ["Par 3", "Par 4", "Par 5"])
+
+    # The remaining inputs rerun the script only on "Run Hole Strategy"
+    with st.form("hole_strategy_form"):
+        col_s1, col_s2 = st.columns(2)
+        with col_s1:
+            hole_yards = st.number_input(
+                "Hole Yardage",
+                min_value=60.0,
+                max_value=650.0,
+                value=420.0 if par_type == "Par 4" else (180.0 if par_type == "Par 3" else 520.0),
+                step=1.0,
+            )
+        with col_s2:
+            fairway_width = st.selectbox(
+                "Fairway Width (for tee shot)", 
+                ["Narrow", "Medium", "Wide"],
+                index=1,
+                key="par_fairway_width"
+            )
+            tee_left_trouble = st.selectbox(
+                "Trouble Left?", 
+                _TROUBLE_LEVELS,
+                key="par_tee_left_trouble",
+            )
+            tee_right_trouble = st.selectbox(
+                "Trouble Right?", 
+                _TROUBLE_LEVELS,
+                 key="par_tee_right_trouble",
+            )
+
+        run_strategy = st.form_submit_button("Run Hole Strategy")
 
     skill_factor = 1.0 * st.session_state.handicap_factor
 
-    if st.button("Run Hole Strategy"):
+    if run_strategy:
         if par_type == "Par 3":
-            res = sge.par3_strategy(
-                hole_yards=hole_yards,
-                candidates=all_shots_base,
-                skill_factor=skill_factor,
-                green_width=0.0,
-                short_trouble_label="None",
-                long_trouble_label="None",
-                left_trouble_label="None",
-                right_trouble_label="None",
-                strategy_label=sge.STRATEGY_BALANCED,
-                sg_profile_factor=st.session_state.handicap_factor,
+            res = _cached_par3(
+                driver_speed, hole_yards, skill_factor, st.session_state.handicap_factor
             )
             best = res.get("best")
             if best is None:
                 st.warning("No suitable Par 3 strategy found.")
             else:
-                st.markdown(
-                    f"**Recommended Tee Shot:** {best['club']} — {best['shot_type']}  "
-                    f"(Total ≈ {best['total']:.0f} yds, SG vs baseline ≈ {best['sg']:.3f})"
-                )
-                st.caption(
-                    f"Approx. Probability on/near Green: Within 10 yds ≈ {best['p_within_10']*100:.0f}%, "
-                    f"Within 5 yds ≈ {best['p_within_5']*100:.0f}%."
-                )
+                st.markdown(_PAR3_TEE_TMPL.format_map(best))
+                st.caption(_PAR3_ODDS_TMPL.format_map(best))
 
         elif par_type == "Par 4":
-            res = sge.par4_strategy(
-                hole_yards=hole_yards,
-                full_bag=full_bag,
-                skill_factor=skill_factor,
-                fairway_width_label=fairway_width,
-                tee_left_trouble_label=tee_left_trouble,
-                tee_right_trouble_label=tee_right_trouble,
-                sg_profile_factor=st.session_state.handicap_factor,
+            res = _cached_par45(
+                "Par 4", driver_speed, hole_yards, fairway_width,
+                tee_left_trouble, tee_right_trouble,
+                skill_factor, st.session_state.handicap_factor,
             )
             best = res.get("best")
             if best is None:
                 st.warning("No suitable Par 4 strategy found.")
             else:
-                st.markdown(
-                    f"**Tee Club:** {best['tee_club']} "
-                    f"(Avg Total ≈ {best['avg_total']:.0f} yds, "
-                    f"Remaining ≈ {best['remaining_yards']:.0f} yds)"
-                )
-                st.caption(
-                    f"Expected Score ≈ {best['expected_score']:.2f} "
-                    f"(SG vs Baseline ≈ {best['sg_vs_baseline']:.3f})."
-                )
+                st.markdown(_TEE_CLUB_TMPL.format_map(best))
+                st.caption(_PAR4_SCORE_TMPL.format_map(best))
 
         elif par_type == "Par 5":
-            res = sge.par5_strategy(
-                hole_yards=hole_yards,
-                full_bag=full_bag,
-                skill_factor=skill_factor,
-                fairway_width_label=fairway_width,
-                tee_left_trouble_label=tee_left_trouble,
-                tee_right_trouble_label=tee_right_trouble,
-                sg_profile_factor=st.session_state.handicap_factor,
+            res = _cached_par45(
+                "Par 5", driver_speed, hole_yards, fairway_width,
+                tee_left_trouble, tee_right_trouble,
+                skill_factor, st.session_state.handicap_factor,
             )
 
             best_tee = res.get("best_tee")
             if not best_tee:
                 st.warning("No valid tee strategy found for this par 5.")
             else:
-                st.markdown(
-                    f"**Tee Club:** {best_tee['tee_club']} "
-                    f"(Avg Total ≈ {best_tee['avg_total']:.0f} yds, "
-                    f"Remaining ≈ {best_tee['remaining_yards']:.0f} yds)"
-                )
+                st.markdown(_TEE_CLUB_TMPL.format_map(best_tee))
                 st.markdown(f"**Plan:** {res['strategy']}")
 
                 go_for_it_score = res.get("go_for_it_score")
@@ -1444,40 +1584,67 @@ with tab_strategy:
 # TOURNAMENT PREP TAB
 # ============================================================
 
-with tab_prep:
+_RULES_OF_THUMB_MD = (
+    "- Into Wind: add ~1 yard per mph of wind for a 150-yard shot (scale a bit for longer/shorter).  \n"
+    "- Downwind: subtract ~0.5 yard per mph of wind.  \n"
+    "- Slight Uphill: add ~5 yards.  \n"
+    "- Moderate Uphill: add ~10 yards.  \n"
+    "- Slight Downhill: subtract ~5 yards.  \n"
+    "- Moderate Downhill: subtract ~10 yards.  \n"
+    "- Cold (10°F below 75°F): lose ~2–3 yards at 150y; hot (10°F above) gain ~2–3 yards.  \n"
+    "- Bad Lie (thick rough / buried): expect it to come out shorter; good lie: normal."
+)
+
+
+# Whole results block (heading, both yardages, feedback) as one markdown write
+_PREP_RESULTS_MD = """
+### Results
+
+<div style="display:flex; gap:2rem; margin-bottom:0.6rem;">
+    <div>
+        <div style="color:#aaaaaa; font-size:0.9rem;">Your Plays-Like Estimate</div>
+        <div style="font-size:1.8rem; font-weight:600;">{guess:.1f} yds</div>
+    </div>
+    <div>
+        <div style="color:#aaaaaa; font-size:0.9rem;">Engine Plays-Like</div>
+        <div style="font-size:1.8rem; font-weight:600;">{engine:.1f} yds</div>
+    </div>
+</div>
+
+- Difference: **{diff_abs:.1f} yds** ({played}{direction} the engine).
+
+- {qualitative}
+"""
+
+
+@st.fragment
+def _render_prep_tab():
+    """Tournament Prep tab body; its widgets rerun only this fragment."""
     st.header("Tournament Prep:")
 
     # --- Buttons / scenario control ---
     col_gen, col_info = st.columns([2, 3])
     with col_gen:
         if st.button("Generate Random Scenario 🎯"):
-            st.session_state.prep_scenario = sge.generate_random_scenario()
-            st.session_state.prep_revealed = False
+            st.session_state.prep_scenario = None  # regenerated just below
             help =("Use this to **train your brain** to do legal on-course adjustments")
 
     scenario = st.session_state.get("prep_scenario", None)
 
-    # If no scenario yet, create one on first load
+    # Single generation path: first load, or after "Generate" cleared it
     if scenario is None:
         scenario = sge.generate_random_scenario()
         st.session_state.prep_scenario = scenario
+        st.session_state.prep_scenario_json = None
         st.session_state.prep_revealed = False
 
+    # Serialized once per scenario (also fills sessions that predate the
+    # cached string); st.json passes strings straight through
+    if st.session_state.get("prep_scenario_json") is None:
+        st.session_state.prep_scenario_json = json.dumps(scenario)
+
     st.markdown("**Raw Scenario:**")
-    st.json(scenario)
-
-    # --- Engine plays-like (hidden until reveal) ---
-    # You can choose to include your personal tendency here; for now we keep it Neutral
-    engine_plays_like = sge.calculate_plays_like_yardage(
-        raw_yards=scenario["raw_yards"],
-        wind_dir=scenario["wind_dir"],
-        wind_strength_label=scenario["wind_strength"],
-        elevation_label=scenario["elevation"],
-        lie_label=scenario["lie"],
-        tendency_label="Neutral",      # or st.session_state.tendency if you prefer
-        temp_f=st.session_state.get("temp_f", 75.0),
-        baseline_temp_f=75.0,
-    )
+    st.json(st.session_state.prep_scenario_json)
 
     # --- User guess input ---
     st.markdown("### Your Mental Adjustment")
@@ -1500,8 +1667,21 @@ with tab_prep:
         st.session_state.prep_revealed = True
 
     if st.session_state.get("prep_revealed", False):
-        # Use last guess from session_state to keep it stable across reruns
-        user_guess = float(st.session_state.get("prep_guess", guess or 0.0))
+        # --- Engine plays-like (only needed once revealed) ---
+        # You can choose to include your personal tendency here; for now we keep it Neutral
+        engine_plays_like = sge.calculate_plays_like_yardage(
+            raw_yards=scenario["raw_yards"],
+            wind_dir=scenario["wind_dir"],
+            wind_strength_label=scenario["wind_strength"],
+            elevation_label=scenario["elevation"],
+            lie_label=scenario["lie"],
+            tendency_label="Neutral",      # or st.session_state.tendency if you prefer
+            temp_f=st.session_state.get("temp_f", 75.0),
+            baseline_temp_f=75.0,
+        )
+
+        # number_input (keyed "prep_guess") already returns a stable float
+        user_guess = guess
         diff = user_guess - engine_plays_like
         diff_abs = abs(diff)
 
@@ -1516,18 +1696,16 @@ with tab_prep:
 
         direction = "longer than" if diff > 0 else "shorter than" if diff < 0 else "exactly equal to"
 
-        st.markdown("### Results")
-
-        col_l, col_r = st.columns(2)
-        with col_l:
-            st.metric("Your Plays-Like Estimate", f"{user_guess:.1f} yds")
-        with col_r:
-            st.metric("Engine Plays-Like", f"{engine_plays_like:.1f} yds")
-
         st.markdown(
-            f"- Difference: **{diff_abs:.1f} yds** ({'you played it ' if diff != 0 else ''}"
-            f"{direction} the engine).\n\n"
-            f"- {qualitative}"
+            _PREP_RESULTS_MD.format(
+                guess=user_guess,
+                engine=engine_plays_like,
+                diff_abs=diff_abs,
+                played="you played it " if diff != 0 else "",
+                direction=direction,
+                qualitative=qualitative,
+            ),
+            unsafe_allow_html=True,
         )
 
         st.info(
@@ -1538,58 +1716,52 @@ with tab_prep:
 
     st.markdown("---")
     st.markdown("#### Suggested Mental Rules of Thumb (Practice Only)")
-    st.markdown(
-        "- Into Wind: add ~1 yard per mph of wind for a 150-yard shot (scale a bit for longer/shorter).  \n"
-        "- Downwind: subtract ~0.5 yard per mph of wind.  \n"
-        "- Slight Uphill: add ~5 yards.  \n"
-        "- Moderate Uphill: add ~10 yards.  \n"
-        "- Slight Downhill: subtract ~5 yards.  \n"
-        "- Moderate Downhill: subtract ~10 yards.  \n"
-        "- Cold (10°F below 75°F): lose ~2–3 yards at 150y; hot (10°F above) gain ~2–3 yards.  \n"
-        "- Bad Lie (thick rough / buried): expect it to come out shorter; good lie: normal."
-    )
+    st.markdown(_RULES_OF_THUMB_MD)
 
 
+with tab_prep:
+    _render_prep_tab()
+
 
 # ============================================================
 # INFO TAB
 # ============================================================
 
-with tab_info:
-    st.subheader("How Golf Caddy Works")
+_HOW_IT_WORKS_MD = """
+**Golf Caddy** combines a simple distance model, dispersion windows, and a
+strokes-gained style engine to help you choose smarter shots on the course.
 
-    st.markdown(
-        """
-        **Golf Caddy** combines a simple distance model, dispersion windows, and a
-        strokes-gained style engine to help you choose smarter shots on the course.
+### Modes
 
-        ### Modes
+- **Course Mode**
+  - Quick: minimal inputs for on-course speed.
+  - Advanced: describe trouble, tendencies, and strategy to get richer recommendations.
 
-        - **Course Mode**
-          - Quick: minimal inputs for on-course speed.
-          - Advanced: describe trouble, tendencies, and strategy to get richer recommendations.
+- **Range Mode**
+  - Explore your scaled bag distances and scoring shots by club.
 
-        - **Range Mode**
-          - Explore your scaled bag distances and scoring shots by club.
+- **Yardages**
+  - Full-bag and scoring-shot tables, including a rough dispersion estimate.
 
-        - **Yardages**
-          - Full-bag and scoring-shot tables, including a rough dispersion estimate.
+- **Putting Prep**
+  - Simulates putting probability based off various green conditions.
 
-        - **Putting Prep**
-          - Simulates putting probability based off various green conditions.
+- **Par Strategy**
+  - High-level guidance for Par 3, 4, and 5 holes using tee-club choices,
+    three-shot vs two-shot plans, and expected score comparisons.
 
-        - **Par Strategy**
-          - High-level guidance for Par 3, 4, and 5 holes using tee-club choices,
-            three-shot vs two-shot plans, and expected score comparisons.
+- **Tournament Prep**
+  - Random practice scenarios for training your own 'mental caddy' to make
+    plays-like adjustments without violating tournament rules.
 
-        - **Tournament Prep**
-          - Random practice scenarios for training your own 'mental caddy' to make
-            plays-like adjustments without violating tournament rules.
+### Disclaimer
 
-        ### Disclaimer
+All models are approximate and based on simplified physics and amateur
+strokes-gained curves. Always use your judgment, local rules, and competition
+conditions when making decisions on the golf course.
+"""
 
-        All models are approximate and based on simplified physics and amateur
-        strokes-gained curves. Always use your judgment, local rules, and competition
-        conditions when making decisions on the golf course.
-        """
-    )
+with tab_info:
+    st.subheader("How Golf Caddy Works")
+
+    st.markdown(_HOW_IT_WORKS_MD)
@@ -1,3 +1,5 @@
+import functools
+import heapq
 import math
 import random
 
@@ -41,6 +43,19 @@ FULL_BAG_BASE = [
     ("LW",      75, 34.0,10500,  75,  81),
 ]
 
+# Dispersion category per full-bag club (anything else is a scoring wedge)
+CLUB_CATEGORY = {
+    "Driver": "driver",
+    "3W":     "wood",
+    "3H":     "hybrid",
+    "4i":     "long_iron",
+    "5i":     "long_iron",
+    "6i":     "mid_iron",
+    "7i":     "mid_iron",
+    "8i":     "short_iron",
+    "9i":     "short_iron",
+}
+
 # Shot-type multipliers
 SHOT_MULTIPLIERS = {
     "Full":        1.00,
@@ -80,6 +95,13 @@ WIND_STRENGTH_MAP = {
     "heavy":  20,
 }
 
+# Yards added to the plays-like target for a known distance miss
+TENDENCY_BIAS = {
+    "Neutral":        0.0,
+    "Usually Short":  3.0,
+    "Usually Long":  -3.0,
+}
+
 # Strategies
 STRATEGY_BALANCED = "Balanced"
 STRATEGY_CONSERVATIVE = "Conservative"
@@ -118,32 +140,37 @@ def adjust_for_wind(target, wind_dir, wind_strength_label):
     return adjusted
 
 
-def apply_elevation(target, elevation_label):
+@functools.lru_cache(maxsize=16)
+def _elevation_delta(elevation_label):
+    """Yards added for an elevation label (cached per label)."""
     label = (elevation_label or "flat").lower().strip()
     if label.startswith("slight up"):
-        delta = 5.0
-    elif label.startswith("moderate up"):
-        delta = 10.0
-    elif label.startswith("slight down"):
-        delta = -5.0
-    elif label.startswith("moderate down"):
-        delta = -10.0
-    else:
-        delta = 0.0
-    return target + delta
+        return 5.0
+    if label.startswith("moderate up"):
+        return 10.0
+    if label.startswith("slight down"):
+        return -5.0
+    if label.startswith("moderate down"):
+        return -10.0
+    return 0.0
+
+
+def apply_elevation(target, elevation_label):
+    return target + _elevation_delta(elevation_label)
+
+
+# Plays-like multiplier by lie quality (unknown labels -> 1.00)
+LIE_MULTIPLIERS = {
+    "good": 1.00,
+    "ok":   1.05,
+    "okay": 1.05,
+    "bad":  1.12,
+}
 
 
 def apply_lie(target, lie_label):
     lie = (lie_label or "good").lower().strip()
-    if lie == "good":
-        mult = 1.00
-    elif lie in ("ok", "okay"):
-        mult = 1.05
-    elif lie == "bad":
-        mult = 1.12
-    else:
-        mult = 1.00
-    return target * mult
+    return target * LIE_MULTIPLIERS.get(lie, 1.00)
 
 
 def _f_to_k(temp_f: float) -> float:
@@ -251,6 +278,7 @@ def _apply_environment_plays_like(
 
 
 
+@functools.lru_cache(maxsize=4096)
 def calculate_plays_like_yardage(
     raw_yards: float,
     wind_dir: str,
@@ -276,6 +304,8 @@ def calculate_plays_like_yardage(
       - We assume your *bag yardages* are calibrated at baseline_temp_f
         (e.g., 75°F). So temperature is modeled by changing the *effective
         target*, not your stored yardages.
+      - Memoized: every input is a scalar/label, and the app asks for the
+        same scenario again on each Streamlit rerun.
     """
     val = float(raw_yards)
 
@@ -285,11 +315,7 @@ def calculate_plays_like_yardage(
     val = apply_lie(val, lie_label)
 
     # Player tendency (distance bias)
-    tendency_label = (tendency_label or "Neutral").strip()
-    if tendency_label == "Usually Short":
-        val += 3.0
-    elif tendency_label == "Usually Long":
-        val -= 3.0
+    val += TENDENCY_BIAS.get((tendency_label or "Neutral").strip(), 0.0)
 
     # Environment (air density / temperature)
     if temp_f is not None:
@@ -307,6 +333,7 @@ def calculate_plays_like_yardage(
 # Dispersion & SG helpers
 # ============================================================
 
+@functools.lru_cache(maxsize=8)
 def get_dispersion_sigma(category):
     cat = (category or "").lower()
     if cat in ("driver", "wood", "hybrid"):
@@ -322,6 +349,7 @@ def get_dispersion_sigma(category):
     return 10.0
 
 
+@functools.lru_cache(maxsize=8)
 def get_lateral_sigma(category):
     cat = (category or "").lower()
     if cat in ("driver", "wood", "hybrid"):
@@ -336,6 +364,7 @@ def get_lateral_sigma(category):
         return 7.0
     return 10.0
 
+@functools.lru_cache(maxsize=16)
 def lie_dispersion_factor(surface: str) -> float:
     """
     How much the *lie / surface* inflates dispersion (shot pattern size).
@@ -359,6 +388,7 @@ def lie_dispersion_factor(surface: str) -> float:
     # Fallback
     return 1.0
 
+@functools.lru_cache(maxsize=64)
 def lie_distance_factor(surface: str, category: str) -> float:
     """
     How much the starting surface shortens carry/total distance.
@@ -400,6 +430,7 @@ def lie_distance_factor(surface: str, category: str) -> float:
 
     return 1.0
 
+@functools.lru_cache(maxsize=32)
 def green_firmness_roll_adjust(category: str, firmness_label: str) -> float:
     """
     Small additive tweak (in yards) to TOTAL distance based on green firmness.
@@ -438,6 +469,19 @@ def _expected_strokes_from_distance(distance_yards):
         return 2.5 + 0.0056 * d
     return 3.0 + 0.0045 * d
 
+# Lie difficulty multiplier on the distance baseline (unknown surfaces -> 1.0)
+SURFACE_STROKES_MULT = {
+    "tee": 1.0,
+    "fairway": 1.0,
+    "rough": 1.06,
+    "sand": 1.12,
+    "bunker": 1.12,
+    "recovery": 1.20,
+    "trees": 1.20,
+    "punch": 1.20,
+    "green": 0.80,
+}
+
 def expected_strokes(distance_yards, surface="fairway", handicap_factor=1.0):
     """
     Handicap + lie aware expected-strokes model.
@@ -452,24 +496,13 @@ def expected_strokes(distance_yards, surface="fairway", handicap_factor=1.0):
     dist = max(1.0, distance_yards)
     base = _expected_strokes_from_distance(dist)
 
-    s = (surface or "fairway").lower()
-    if s in ("tee", "fairway"):
-        surface_mult = 1.0
-    elif s == "rough":
-        surface_mult = 1.06
-    elif s in ("sand", "bunker"):
-        surface_mult = 1.12
-    elif s in ("recovery", "trees", "punch"):
-        surface_mult = 1.20
-    elif s == "green":
-        surface_mult = 0.80
-    else:
-        surface_mult = 1.0
+    surface_mult = SURFACE_STROKES_MULT.get((surface or "fairway").lower(), 1.0)
 
     # Handicap factor scales difficulty up or down
     return base * surface_mult * handicap_factor
 
 
+@functools.lru_cache(maxsize=8)
 def _trouble_factor(label):
     l = (label or "none").lower()
     if l == "mild":
@@ -479,6 +512,7 @@ def _trouble_factor(label):
     return 1.0
 
 
+@functools.lru_cache(maxsize=8)
 def _strategy_multiplier(strategy_label):
     s = (strategy_label or STRATEGY_BALANCED).lower()
     if s == "conservative":
@@ -550,20 +584,7 @@ def build_all_candidate_shots(driver_speed_mph):
         carry = row["Carry (yds)"]
         total = row["Total (yds)"]
 
-        if club == "Driver":
-            cat = "driver"
-        elif club == "3W":
-            cat = "wood"
-        elif club == "3H":
-            cat = "hybrid"
-        elif club in ("4i", "5i"):
-            cat = "long_iron"
-        elif club in ("6i", "7i"):
-            cat = "mid_iron"
-        elif club in ("8i", "9i"):
-            cat = "short_iron"
-        else:
-            cat = "scoring_wedge"
+        cat = CLUB_CATEGORY.get(club, "scoring_wedge")
 
         all_shots.append(
             {
@@ -584,58 +605,6 @@ def build_all_candidate_shots(driver_speed_mph):
 # Recommendation engine (simplified SG)
 # ============================================================
 
-def recommend_shots_with_sg(
-    target_total,
-    candidates,
-    short_trouble_label="None",
-    long_trouble_label="None",
-    left_trouble_label="None",
-    right_trouble_label="None",
-    green_firmness_label="Medium",
-    strategy_label=STRATEGY_BALANCED,
-    start_distance_yards=None,
-    start_surface="fairway",
-    front_yards=0.0,
-    back_yards=0.0,
-    skill_factor=1.0,
-    pin_lateral_offset=0.0,
-    green_width=0.0,
-    n_sim=DEFAULT_N_SIM,
-    top_n=5,
-    sg_profile_factor=1.0,
-):
-    """
-    Rank candidate shots by strokes-gained style value using a more realistic baseline:
-
-      - Baseline = expected_strokes(start_distance, start_surface, handicap_factor)
-      - For each shot:
-          * We approximate remaining distance by |shot.total - target_total|
-          * Compute expected_strokes for that leave from a fairway-like surface
-          * Inflate that leave if short/long trouble is present in the miss direction
-          * Total exp strokes = 1 (this shot) + leave_exp
-          * SG = baseline - total_exp
-
-    This is still an approximation but much closer to true SG logic:
-      'How many strokes does this choice cost vs my baseline from here?'
-    """
-    if start_distance_yards is None:
-        start_distance_yards = target_total
-
-    # Baseline SG from current position
-    baseline = expected_strokes(
-        distance_yards=start_distance_yards,
-        surface=start_surface,
-        handicap_factor=sg_profile_factor,
-    )
-
-    sf = _strategy_multiplier(strategy_label)
-    short_factor = _trouble_factor(short_trouble_label)
-    long_factor = _trouble_factor(long_trouble_label)
-    left_factor = _trouble_factor(left_trouble_label)
-    right_factor = _trouble_factor(right_trouble_label)
-    
-    results = []
-
 def recommend_shots_with_sg(
     target_total,
     candidates,
@@ -684,6 +653,17 @@ def recommend_shots_with_sg(
     left_factor = _trouble_factor(left_trouble_label)
     right_factor = _trouble_factor(right_trouble_label)
 
+    # Loop-invariant terms (same for every candidate)
+    lie_factor = lie_dispersion_factor(start_surface)
+    side_safe = 12.0  # yards off-line that we consider "ok" around the green
+    short_trouble = (short_trouble_label or "none").lower() != "none"
+    long_trouble = (long_trouble_label or "none").lower() != "none"
+    left_trouble = (left_trouble_label or "none").lower() != "none"
+    right_trouble = (right_trouble_label or "none").lower() != "none"
+
+    # Dispersion terms depend only on category; compute once per category
+    cat_terms = {}
+
     results = []
 
     for shot in candidates:
@@ -699,10 +679,29 @@ def recommend_shots_with_sg(
         diff = eff_total - target_total          # + = long, - = short
         abs_diff = abs(diff)
 
-        # --- 2) Depth dispersion & proximity ---
-        lie_factor = lie_dispersion_factor(start_surface)
-        sigma_depth = get_dispersion_sigma(cat) * skill_factor * lie_factor
+        # Depth sigma + lateral multiplier, cached per category
+        terms = cat_terms.get(cat)
+        if terms is None:
+            sigma_depth = get_dispersion_sigma(cat) * skill_factor * lie_factor
+            sigma_lat = get_lateral_sigma(cat) * skill_factor * lie_factor
+
+            # Probability of being outside +/- side_safe sideways
+            p_side_miss = 1.0 - (
+                _normal_cdf(side_safe, 0.0, sigma_lat)
+                - _normal_cdf(-side_safe, 0.0, sigma_lat)
+            )
+            # With symmetric distribution, split equally
+            p_left_miss = 0.5 * p_side_miss
+            p_right_miss = 0.5 * p_side_miss
+
+            lateral_mult = 1.0
+            lateral_mult += p_left_miss * (left_factor - 1.0)
+            lateral_mult += p_right_miss * (right_factor - 1.0)
+
+            terms = cat_terms[cat] = (sigma_depth, sigma_lat, p_side_miss, lateral_mult)
+        sigma_depth, sigma_lat, p_side_miss, lateral_mult = terms
 
+        # --- 2) Depth dispersion & proximity ---
         # Probability of finishing within ±5 yards in depth
         p_close = _normal_cdf(5.0, diff, sigma_depth) - _normal_cdf(
             -5.0, diff, sigma_depth
@@ -725,23 +724,7 @@ def recommend_shots_with_sg(
         elif diff > 0: # finishes long
             trouble_mult_depth *= long_factor
 
-        # --- 4) Lateral trouble multiplier (left/right) ---
-        sigma_lat = get_lateral_sigma(cat) * skill_factor * lie_factor
-        side_safe = 12.0  # yards off-line that we consider "ok" around the green
-
-        # Probability of being outside +/- side_safe sideways
-        p_side_miss = 1.0 - (
-            _normal_cdf(side_safe, 0.0, sigma_lat)
-            - _normal_cdf(-side_safe, 0.0, sigma_lat)
-        )
-        # With symmetric distribution, split equally
-        p_left_miss = 0.5 * p_side_miss
-        p_right_miss = 0.5 * p_side_miss
-
-        lateral_mult = 1.0
-        lateral_mult += p_left_miss * (left_factor - 1.0)
-        lateral_mult += p_right_miss * (right_factor - 1.0)
-
+        # --- 4) Lateral trouble multiplier (left/right, per category) ---
         total_trouble_mult = trouble_mult_depth * lateral_mult
 
         # Apply strategy (aggressive vs conservative) on top
@@ -761,21 +744,21 @@ def recommend_shots_with_sg(
             )
 
         if trouble_mult_depth > 1.0:
-            if diff < 0 and short_trouble_label.lower() != "none":
+            if diff < 0 and short_trouble:
                 reason_parts.append(
                     "Short misses are penal here; being short is risky."
                 )
-            elif diff > 0 and long_trouble_label.lower() != "none":
+            elif diff > 0 and long_trouble:
                 reason_parts.append(
                     "Long misses are penal here; being long is risky."
                 )
 
         if lateral_mult > 1.0:
-            if left_trouble_label.lower() != "none":
+            if left_trouble:
                 reason_parts.append(
                     "Missing left brings real trouble into play."
                 )
-            if right_trouble_label.lower() != "none":
+            if right_trouble:
                 reason_parts.append(
                     "Missing right brings real trouble into play."
                 )
@@ -800,13 +783,16 @@ def recommend_shots_with_sg(
                 "sg": sg,
                 "expected_strokes": exp_strokes,
                 "p_close": p_close,
+                "sigma_depth": sigma_depth,
+                "sigma_lat": sigma_lat,
+                "p_side_miss": p_side_miss,
                 "reason": " ".join(reason_parts),
             }
         )
         results.append(shot_out)
 
-    results.sort(key=lambda s: (-s["sg"], abs(s["diff"])))
-    return results[:top_n]
+    # Partial selection: same order as a full stable sort, truncated to top_n
+    return heapq.nsmallest(top_n, results, key=lambda s: (-s["sg"], abs(s["diff"])))
 
 
 def compute_optimal_carry_for_target(target_total, category):
@@ -918,8 +904,10 @@ def par4_strategy(
     def exp_strokes(d, surface="fairway"):
         return expected_strokes(d, surface=surface, handicap_factor=sg_profile_factor)
 
-    def trouble_mult(label):
-        return _trouble_factor(label)
+    # Tee trouble multiplier (if you miss left/right into something bad);
+    # depends only on the labels, so compute it once for every tee club
+    t_mult = max(_trouble_factor(tee_left_trouble_label),
+                 _trouble_factor(tee_right_trouble_label))
 
     options = []
 
@@ -945,10 +933,6 @@ def par4_strategy(
         # Expected strokes for the approach (from fairway distance 'remaining')
         approach = exp_strokes(remaining, surface="fairway")
 
-        # Tee trouble multiplier (if you miss left/right into something bad)
-        t_mult = max(trouble_mult(tee_left_trouble_label),
-                     trouble_mult(tee_right_trouble_label))
-
         # Only the miss-prob portion gets penalized
         approach *= 1.0 + miss_prob * (t_mult - 1.0)
 
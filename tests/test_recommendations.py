@@ -87,3 +87,34 @@ def test_severe_long_trouble_penalizes_long_option():
     six_long = next(s for s in long_trouble if s["club"] == "6i")
 
     assert six_long["sg"] < six_no["sg"]
+
+
+def test_recommendations_do_not_mutate_candidates():
+    candidates = _simple_candidates()
+    before = [dict(c) for c in candidates]
+
+    sge.recommend_shots_with_sg(
+        target_total=150,
+        candidates=candidates,
+        start_surface="rough",
+        green_firmness_label="Firm",
+        top_n=3,
+    )
+
+    assert candidates == before
+
+
+def test_recommendations_expose_dispersion_terms():
+    ranked = sge.recommend_shots_with_sg(
+        target_total=150,
+        candidates=_simple_candidates(),
+        start_surface="rough",
+        skill_factor=1.3,
+        top_n=3,
+    )
+
+    lie = sge.lie_dispersion_factor("rough")
+    for s in ranked:
+        assert s["sigma_depth"] == sge.get_dispersion_sigma(s["category"]) * 1.3 * lie
+        assert s["sigma_lat"] == sge.get_lateral_sigma(s["category"]) * 1.3 * lie
+        assert 0.0 <= s["p_side_miss"] <= 1.0